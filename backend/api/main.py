@@ -3,10 +3,17 @@ FastAPI Backend for AI Agent Data Quality Benchmark Dashboard
 Simplified: Focus on 3 aggregate scores per model
 """
 
-from fastapi import FastAPI
+import os
+import sys
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmark import results_parquet, results_store
+from benchmark.export import dashboard_data
 
 app = FastAPI(
     title="AI Agent Data Quality Benchmark API",
@@ -39,10 +46,11 @@ class Model(BaseModel):
 
 
 class DimensionScores(BaseModel):
-    accuracy: float
-    completeness: float
-    consistency: float
-    uniqueness: float
+    # None: the model has no tasks in this dimension
+    accuracy: Optional[float]
+    completeness: Optional[float]
+    consistency: Optional[float]
+    uniqueness: Optional[float]
 
 
 # ============= Mock Data =============
@@ -100,6 +108,21 @@ MOCK_DIMENSIONS = {
 }
 
 
+# ============= Results Store =============
+# Set RESULTS_STORE to a results store directory (see benchmark/results_store.py)
+# to serve real results. Queries read only the needed Parquet partitions and
+# columns. Without it, the mock data above is served.
+
+RESULTS_STORE = os.environ.get("RESULTS_STORE")
+
+
+def results_root() -> Optional[str]:
+    if not RESULTS_STORE:
+        return None
+    root = results_store.results_dir(RESULTS_STORE)
+    return root if os.path.isdir(root) else None
+
+
 # ============= API Endpoints =============
 
 @app.get("/")
@@ -125,6 +148,9 @@ def get_models():
     - safety: Aggregate of corruption rate, drift
     - operational: Aggregate of reliability, robustness, auditability
     """
+    root = results_root()
+    if root is not None:
+        return dashboard_data(results_parquet.compute_rollups(root))["models"]
     return MOCK_MODELS
 
 
@@ -139,8 +165,16 @@ def get_dimensions(model_id: str):
     - consistency
     - uniqueness
     """
+    root = results_root()
+    if root is not None:
+        # A configured store is the only source: no results means not found
+        dimensions = results_parquet.dimension_breakdown(root, model_id)
+        if dimensions is None:
+            raise HTTPException(status_code=404, detail="Model not found")
+        return dimensions
+
     if model_id not in MOCK_DIMENSIONS:
-        return {"error": "Model not found"}, 404
+        raise HTTPException(status_code=404, detail="Model not found")
     
     return MOCK_DIMENSIONS[model_id]
 
@@ -0,0 +1,220 @@
+"""
+Benchmark CLI
+Backend Agent: `python -m benchmark <command>` entry point (run from backend/)
+
+Commands:
+    inject   Inject errors into a clean dataset and create benchmark tasks
+    run      Send tasks to models and store their raw outputs
+    score    Score one stored output and print its metrics
+    rescore  Re-score stored outputs whose metric versions changed
+    export   Write the static dashboard bundle (rollups + task shards)
+
+Only the standard library is imported at startup. pandas, scipy and the
+provider SDKs are imported inside the command that needs them, so quick
+commands (--help, export) start fast. Use --timings to print how long
+startup and each lazy import took, and --timings-log to append them to a
+JSON-lines file for tracking over time.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+_START = time.perf_counter()
+
+# Lazy import name -> seconds spent importing it
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+def _lazy_import(name: str):
+    """Import a module on first use and record how long it took"""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = time.perf_counter() - start
+    return module
+
+
+# ============= Commands =============
+
+def cmd_inject(args: argparse.Namespace) -> int:
+    pd = _lazy_import("pandas")
+    results_store = _lazy_import("benchmark.results_store")
+    tasks = _lazy_import("benchmark.tasks")
+
+    dataset_id = args.dataset_id or os.path.splitext(os.path.basename(args.dataset))[0]
+    clean = pd.read_csv(args.dataset)
+    os.makedirs(os.path.dirname(results_store.dataset_path(args.store, dataset_id)), exist_ok=True)
+    os.makedirs(os.path.dirname(results_store.task_path(args.store, dataset_id)), exist_ok=True)
+    clean.to_csv(results_store.dataset_path(args.store, dataset_id), index=False)
+
+    for dimension in args.dimension:
+        for difficulty in args.difficulty:
+            task = tasks.create_task(
+                args.store, dataset_id, dimension, difficulty,
+                seed=args.seed, exclude_columns=args.exclude_column
+            )
+            print(f"{task['task_id']}: {len(task['injected_row_indices'])} rows, "
+                  f"targets={task['target_columns']}")
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    executor = _lazy_import("benchmark.executor")
+    try:
+        _lazy_import("dotenv").load_dotenv()
+    except ImportError:
+        pass
+
+    prices = None
+    if args.prices:
+        with open(args.prices) as f:
+            prices = {model: tuple(price) for model, price in json.load(f).items()}
+    if args.max_cost is not None:
+        unpriced = _lazy_import("benchmark.scheduler").unpriced_models(args.model, prices)
+        if unpriced:
+            print(f"--max-cost needs a price for every model (--prices), missing: {', '.join(unpriced)}",
+                  file=sys.stderr)
+            return 2
+
+    summary = executor.run_tasks(
+        args.store, args.model, task_ids=args.task, runs=args.runs,
+        max_tokens=args.max_tokens, max_cost=args.max_cost, prices=prices,
+        max_concurrency=args.max_concurrency
+    )
+    print(f"Completed {summary['completed']}, skipped {summary['skipped']} "
+          f"(already stored), failed {len(summary['failed'])}")
+    print(f"Spent {summary['spent_tokens']} tokens (${summary['spent_cost']:.2f})")
+    if summary["stopped_by_budget"]:
+        print(f"Stopped at budget ceiling with {summary['remaining']} calls left")
+    for failure in summary["failed"]:
+        print(f"  {failure['model']}/{failure['task_id']} run {failure['run']}: {failure['error']}")
+    return 1 if summary["failed"] else 0
+
+
+def cmd_score(args: argparse.Namespace) -> int:
+    pd = _lazy_import("pandas")
+    results_store = _lazy_import("benchmark.results_store")
+    results_parquet = _lazy_import("benchmark.results_parquet")
+    scoring = _lazy_import("benchmark.scoring")
+
+    record = results_store.load_json(results_store.output_path(args.store, args.model, args.task, args.run))
+    clean = pd.read_csv(results_store.dataset_path(args.store, record["dataset_id"]))
+    result = scoring.score_output(record, clean)
+    results_parquet.write_results(results_store.results_dir(args.store), [result])
+    print(json.dumps(result, indent=2, default=float))
+    return 1 if result["error"] else 0
+
+
+def cmd_rescore(args: argparse.Namespace) -> int:
+    rescore = _lazy_import("benchmark.rescore")
+
+    summary = rescore.rescore(args.store, workers=args.workers, force=args.force)
+    print(f"Re-scored {summary['rescored']}/{summary['planned']} outputs "
+          f"in {summary['seconds']:.1f}s ({len(summary['failed'])} failed)")
+    for failure in summary["failed"]:
+        print(f"  {failure['model']}/{failure['task_id']}: {failure['error']}")
+    return 1 if summary["failed"] else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    export = _lazy_import("benchmark.export")
+
+    manifest = export.export_bundle(args.store, args.out)
+    n_shards = sum(len(datasets) for datasets in manifest["shards"].values())
+    print(f"Exported bundle {manifest['version']} ({n_shards} task shards) to {args.out}")
+    if args.data_json:
+        data = export.export_dashboard_json(args.store, args.data_json)
+        print(f"Exported {len(data['models'])} models to {args.data_json}")
+    return 0
+
+
+# ============= Parser =============
+
+DIMENSIONS = ["accuracy", "completeness", "consistency", "uniqueness"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="AI agent data quality benchmark")
+    parser.add_argument("--timings", action="store_true", help="Print startup and lazy import times")
+    parser.add_argument("--timings-log", metavar="FILE", help="Append startup and import times to a JSON-lines file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_store(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--store", required=True, help="Results store root directory")
+
+    inject = subparsers.add_parser("inject", help="Create benchmark tasks from a clean dataset")
+    add_store(inject)
+    inject.add_argument("--dataset", required=True, help="Clean dataset CSV")
+    inject.add_argument("--dataset-id", help="Dataset ID (default: file name)")
+    inject.add_argument("--dimension", action="append", choices=DIMENSIONS, help="Repeatable (default: all)")
+    inject.add_argument("--difficulty", action="append", choices=DIFFICULTIES, help="Repeatable (default: all)")
+    inject.add_argument("--exclude-column", action="append", default=[], help="Never inject into this column")
+    inject.add_argument("--seed", type=int, default=0)
+    inject.set_defaults(func=cmd_inject)
+
+    run = subparsers.add_parser("run", help="Send tasks to models and store raw outputs")
+    add_store(run)
+    run.add_argument("--model", action="append", required=True, help="Model ID, repeatable")
+    run.add_argument("--task", action="append", help="Task ID, repeatable (default: all)")
+    run.add_argument("--runs", type=int, default=1, help="Repetitions per task")
+    run.add_argument("--max-tokens", type=int, help="Stop before spending more tokens than this")
+    run.add_argument("--max-cost", type=float, help="Stop before spending more USD than this (needs --prices)")
+    run.add_argument("--prices", help='JSON file: {"model": [usd_per_1k_in, usd_per_1k_out]}')
+    run.add_argument("--max-concurrency", type=int, default=32, help="Upper bound per provider")
+    run.set_defaults(func=cmd_run)
+
+    score = subparsers.add_parser("score", help="Score one stored output")
+    add_store(score)
+    score.add_argument("--model", required=True)
+    score.add_argument("--task", required=True)
+    score.add_argument("--run", type=int, default=0)
+    score.set_defaults(func=cmd_score)
+
+    rescore = subparsers.add_parser("rescore", help="Re-score outputs whose metric versions changed")
+    add_store(rescore)
+    rescore.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    rescore.add_argument("--force", action="store_true", help="Recompute all metrics, ignoring versions")
+    rescore.set_defaults(func=cmd_rescore)
+
+    export = subparsers.add_parser("export", help="Write the static dashboard bundle")
+    add_store(export)
+    export.add_argument("--out", default="../frontend/public/bundle", help="Bundle directory")
+    export.add_argument("--data-json", metavar="FILE", help="Also write a single data.json (rollups only)")
+    export.set_defaults(func=cmd_export)
+
+    return parser
+
+
+def _report_timings(args: argparse.Namespace, startup: float, total: float) -> None:
+    timings = {
+        "command": args.command,
+        "startup_s": round(startup, 4),
+        "total_s": round(total, 4),
+        "imports_s": {name: round(t, 4) for name, t in IMPORT_TIMES.items()},
+    }
+    if args.timings:
+        print(f"\nstartup: {startup * 1000:.0f} ms, total: {total * 1000:.0f} ms", file=sys.stderr)
+        for name, seconds in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+            print(f"  import {name}: {seconds * 1000:.0f} ms", file=sys.stderr)
+    if args.timings_log:
+        with open(args.timings_log, "a") as f:
+            f.write(json.dumps({"timestamp": time.time(), **timings}) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "inject":
+        args.dimension = args.dimension or DIMENSIONS
+        args.difficulty = args.difficulty or DIFFICULTIES
+
+    startup = time.perf_counter() - _START
+    status = args.func(args)
+    _report_timings(args, startup, time.perf_counter() - _START)
+    return status
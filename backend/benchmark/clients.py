@@ -0,0 +1,122 @@
+"""
+Model Clients
+Backend Agent: Thin wrappers over the provider SDKs (Gemini, GPT, Claude)
+
+Each SDK is imported only when a model of that provider is first called,
+so commands that never reach a model do not pay for loading them.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+
+# Model ID prefix -> provider. OpenAI reasoning models (o1, o3) are not
+# listed: they need max_completion_tokens, which the pinned SDK lacks.
+PROVIDER_PREFIXES = {
+    "gemini": "google",
+    "gpt": "openai",
+    "claude": "anthropic",
+}
+
+API_KEY_ENV = {
+    "google": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+
+def provider_for(model: str) -> str:
+    """Provider name for a model ID, e.g. 'claude-4' -> 'anthropic'"""
+    for prefix, provider in PROVIDER_PREFIXES.items():
+        if model.startswith(prefix):
+            return provider
+    raise ValueError(f"Unknown provider for model: {model}")
+
+
+def _api_key(provider: str) -> str:
+    key = os.environ.get(API_KEY_ENV[provider])
+    if not key:
+        raise RuntimeError(f"Set {API_KEY_ENV[provider]} to call {provider} models")
+    return key
+
+
+def _call_openai(model: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+    from openai import OpenAI
+
+    client = OpenAI(api_key=_api_key("openai"))
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+    )
+    return {
+        "text": response.choices[0].message.content or "",
+        "input_tokens": response.usage.prompt_tokens,
+        "output_tokens": response.usage.completion_tokens,
+    }
+
+
+def _call_anthropic(model: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+    from anthropic import Anthropic
+
+    client = Anthropic(api_key=_api_key("anthropic"))
+    response = client.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return {
+        "text": "".join(block.text for block in response.content if block.type == "text"),
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+    }
+
+
+def _call_google(model: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+    import google.generativeai as genai
+
+    genai.configure(api_key=_api_key("google"))
+    response = genai.GenerativeModel(model).generate_content(
+        prompt,
+        generation_config={"max_output_tokens": max_tokens},
+    )
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "text": response.text,
+        "input_tokens": getattr(usage, "prompt_token_count", 0),
+        "output_tokens": getattr(usage, "candidates_token_count", 0),
+    }
+
+
+CALLERS = {
+    "openai": _call_openai,
+    "anthropic": _call_anthropic,
+    "google": _call_google,
+}
+
+
+def output_token_limit(prompt: str) -> int:
+    """
+    Output tokens to allow for a prompt: the reply is the full cleaned
+    dataset, about as long as the prompt. Twice the scheduler's estimate
+    leaves room for CSV tokenizing denser than ~4 characters per token.
+    """
+    from benchmark.scheduler import estimate_tokens
+
+    return max(1024, 2 * estimate_tokens({}, prompt))
+
+
+def call_model(model: str, prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Send one prompt to a model and return its text and token usage
+
+    Args:
+        max_tokens: Output token limit (None = sized to the prompt, see
+            output_token_limit, so large datasets are not truncated)
+
+    Returns:
+        Dictionary with text, input_tokens and output_tokens
+    """
+    if max_tokens is None:
+        max_tokens = output_token_limit(prompt)
+    return CALLERS[provider_for(model)](model, prompt, max_tokens)
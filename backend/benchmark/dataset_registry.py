@@ -0,0 +1,329 @@
+"""
+Shared Dataset Registry
+Backend Agent: Load each clean dataset once and share it across worker processes
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+# Column dtypes that can be memory-mapped directly (bool, int, uint, float,
+# complex, timedelta, datetime without timezone)
+_MAPPABLE_KINDS = "biufcmM"
+
+
+# ============= Writer (main process) =============
+
+class DatasetRegistry:
+    """
+    Registry of clean datasets backed by memory-mapped column files
+
+    Each registered DataFrame is written once, column by column, to `.npy`
+    files under `root`. Worker processes attach to those files by dataset ID
+    with `attach_dataset` / `get_dataset`; the OS page cache holds a single
+    copy, so memory for N workers stays close to 1x the dataset size.
+
+    Numeric, boolean and datetime columns are mapped as-is; nullable
+    (masked) numeric columns are mapped through their numpy representation,
+    float64 with NaN when they hold missing values. Nullable booleans with
+    missing values keep a separate mask, and tz-aware datetimes are stored
+    as UTC values with the timezone in the spec. Text columns are stored
+    as UTF-8 bytes plus an offsets array and come back as Arrow-backed
+    strings over the mapped buffers. Any other column (mixed objects) is
+    stored as categorical codes plus a category table. Attached frames are
+    read-only.
+
+    Registrations are reference-counted: `register` on an already known ID
+    only bumps the count, and the files are deleted when `release` brings it
+    back to zero (or on `close`). On POSIX, workers that already attached
+    keep a valid mapping after deletion.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._owns_root = root is None
+        self.root = root or tempfile.mkdtemp(prefix="dq-datasets-")
+        os.makedirs(self.root, exist_ok=True)
+        self._handles: Dict[str, Dict[str, Any]] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DatasetRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def register(self, dataset_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Publish a clean dataset, or add a reference if already registered
+
+        Args:
+            dataset_id: Unique dataset identifier (used as directory name)
+            df: Clean dataset with a default RangeIndex
+
+        Returns:
+            Picklable handle to pass to worker processes
+        """
+        with self._lock:
+            if dataset_id in self._handles:
+                self._refcounts[dataset_id] += 1
+                return self._handles[dataset_id]
+
+            handle = _write_dataset(os.path.join(self.root, dataset_id), dataset_id, df)
+            self._handles[dataset_id] = handle
+            self._refcounts[dataset_id] = 1
+            return handle
+
+    def release(self, dataset_id: str) -> None:
+        """Drop one reference; delete the backing files when none remain"""
+        with self._lock:
+            if dataset_id not in self._refcounts:
+                raise KeyError(f"Dataset not registered: {dataset_id}")
+            self._refcounts[dataset_id] -= 1
+            if self._refcounts[dataset_id] == 0:
+                handle = self._handles.pop(dataset_id)
+                del self._refcounts[dataset_id]
+                shutil.rmtree(handle["path"], ignore_errors=True)
+
+    def handles(self) -> Dict[str, Dict[str, Any]]:
+        """All live handles by dataset ID, e.g. for a pool initializer"""
+        with self._lock:
+            return dict(self._handles)
+
+    def refcount(self, dataset_id: str) -> int:
+        with self._lock:
+            return self._refcounts.get(dataset_id, 0)
+
+    def close(self) -> None:
+        """Delete every registered dataset regardless of reference counts"""
+        with self._lock:
+            for handle in self._handles.values():
+                shutil.rmtree(handle["path"], ignore_errors=True)
+            self._handles.clear()
+            self._refcounts.clear()
+            if self._owns_root:
+                shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _write_dataset(path: str, dataset_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """Write one DataFrame as per-column .npy files and describe the layout"""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise ValueError(f"Dataset {dataset_id} must have a default RangeIndex (use reset_index)")
+
+    # Write into a scratch directory first so readers never see partial files
+    tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(path))
+    columns = []
+    try:
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            dtype = series.dtype
+            spec = {"name": col, "file": f"{i}.npy"}
+
+            values = _numpy_values(series)
+            if isinstance(dtype, pd.DatetimeTZDtype):
+                utc = series.dt.tz_convert("UTC").dt.tz_localize(None)
+                np.save(os.path.join(tmp_path, spec["file"]), utc.to_numpy())
+                spec["kind"] = "datetime_tz"
+                spec["tz"] = dtype.tz
+            elif isinstance(dtype, pd.BooleanDtype):
+                np.save(os.path.join(tmp_path, spec["file"]), series.to_numpy(dtype=bool, na_value=False))
+                spec["kind"] = "masked_bool"
+                spec["mask"] = f"{i}.mask.npy"
+                np.save(os.path.join(tmp_path, spec["mask"]), series.isna().to_numpy())
+            elif values is not None:
+                np.save(os.path.join(tmp_path, spec["file"]), values)
+                spec["kind"] = "array"
+            elif pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+                _save_strings(tmp_path, spec, series)
+                spec["kind"] = "string"
+            else:
+                categorical = pd.Categorical(series)
+                np.save(os.path.join(tmp_path, spec["file"]), categorical.codes)
+                spec["kind"] = "categorical"
+                spec["categories"] = f"{i}.categories.npy"
+                np.save(
+                    os.path.join(tmp_path, spec["categories"]),
+                    categorical.categories.to_numpy(dtype=object),
+                    allow_pickle=True,
+                )
+            columns.append(spec)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return {
+        "dataset_id": dataset_id,
+        "path": path,
+        "n_rows": len(df),
+        "columns": columns,
+    }
+
+
+def _numpy_values(series: pd.Series) -> Optional[np.ndarray]:
+    """Column as a plain numpy array that can be memory-mapped, or None"""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        return series.to_numpy() if dtype.kind in _MAPPABLE_KINDS else None
+
+    # Nullable extension dtypes (Int64, Float64, boolean, Arrow numerics)
+    numpy_dtype = getattr(dtype, "numpy_dtype", None)
+    if numpy_dtype is None or numpy_dtype.kind not in "biuf":
+        return None
+    if not series.hasnans:
+        return series.to_numpy(dtype=numpy_dtype)
+    if numpy_dtype.kind == "b":
+        return None  # Booleans with missing values need a mask
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _save_strings(tmp_path: str, spec: Dict[str, Any], series: pd.Series) -> None:
+    """Save a text column as Arrow validity, offsets and UTF-8 data buffers"""
+    array = pa.array(series.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+    validity, offsets, data = array.buffers()
+    spec["buffers"] = []
+    for name, buffer in (("validity", validity), ("offsets", offsets), ("data", data)):
+        if buffer is None:
+            spec["buffers"].append(None)
+            continue
+        file = f"{spec['file'][:-len('.npy')]}.{name}.npy"
+        np.save(os.path.join(tmp_path, file), np.frombuffer(buffer, dtype=np.uint8))
+        spec["buffers"].append(file)
+
+
+def _string_array(values: pa.ChunkedArray):
+    """Arrow-backed string array with NaN for missing values, like object columns"""
+    try:
+        dtype = pd.StringDtype("pyarrow", na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        return pd.StringDtype("pyarrow_numpy").construct_array_type()(values)  # pandas 2.2
+    return dtype.construct_array_type()(values, dtype=dtype)
+
+
+# ============= Reader (worker processes) =============
+
+def attach_dataset(handle: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Build a read-only DataFrame over a registered dataset without copying
+
+    Args:
+        handle: Handle returned by DatasetRegistry.register
+
+    Returns:
+        DataFrame whose column buffers are memory-mapped from the registry
+    """
+    data = {}
+    for spec in handle["columns"]:
+        if spec["kind"] == "string":
+            buffers = [
+                None if file is None else pa.py_buffer(np.load(os.path.join(handle["path"], file), mmap_mode="r"))
+                for file in spec["buffers"]
+            ]
+            array = pa.Array.from_buffers(pa.large_string(), handle["n_rows"], buffers)
+            data[spec["name"]] = _string_array(pa.chunked_array([array]))
+            continue
+
+        values = np.load(os.path.join(handle["path"], spec["file"]), mmap_mode="r")
+        if spec["kind"] == "datetime_tz":
+            values = pd.DatetimeIndex(values, copy=False).tz_localize("UTC").tz_convert(spec["tz"])
+        elif spec["kind"] == "masked_bool":
+            mask = np.load(os.path.join(handle["path"], spec["mask"]), mmap_mode="r")
+            values = pd.arrays.BooleanArray(values, mask, copy=False)
+        elif spec["kind"] == "categorical":
+            categories = np.load(os.path.join(handle["path"], spec["categories"]), allow_pickle=True)
+            values = pd.Categorical.from_codes(
+                values,
+                dtype=pd.CategoricalDtype(pd.Index(categories)),
+                validate=False,
+            )
+        data[spec["name"]] = values
+
+    return pd.DataFrame(data, index=pd.RangeIndex(handle["n_rows"]), copy=False)
+
+
+# Per-process state for pool workers: handles received at startup and
+# frames already attached, keyed by dataset ID
+_WORKER_HANDLES: Dict[str, Dict[str, Any]] = {}
+_WORKER_FRAMES: Dict[str, pd.DataFrame] = {}
+
+
+def init_worker(handles: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Pool initializer: make registry handles available to `get_dataset`
+
+    Usage:
+        ProcessPoolExecutor(initializer=init_worker, initargs=(registry.handles(),))
+    """
+    _WORKER_HANDLES.clear()
+    _WORKER_HANDLES.update(handles)
+    _WORKER_FRAMES.clear()
+
+
+def get_dataset(dataset_id: str) -> pd.DataFrame:
+    """Return the clean dataset for `dataset_id`, attaching on first use"""
+    if dataset_id not in _WORKER_FRAMES:
+        if dataset_id not in _WORKER_HANDLES:
+            raise KeyError(f"Dataset not available in this worker: {dataset_id}")
+        _WORKER_FRAMES[dataset_id] = attach_dataset(_WORKER_HANDLES[dataset_id])
+    return _WORKER_FRAMES[dataset_id]
+
+
+# Example usage
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+
+    clean = pd.DataFrame({
+        "order_id": [1001, 1002, 1003],
+        "product": ["Laptop", "Mouse", None],
+        "price": [999.99, 29.99, 79.99],
+        "date": pd.to_datetime(["2024-01-15", "2024-01-16", "2024-01-17"]),
+        "quantity": pd.array([1, None, 3], dtype="Int64"),
+        "shipped": pd.array([True, None, False], dtype="boolean"),
+        "updated": pd.to_datetime(["2024-01-15 10:00", None, "2024-01-17 00:00"]).tz_localize("Europe/Berlin"),
+    })
+
+    def _worker_checksum(dataset_id):
+        df = get_dataset(dataset_id)
+        return float(df["price"].sum()), df["product"].tolist()
+
+    with DatasetRegistry() as registry:
+        handle = registry.register("orders", clean)
+        registry.register("orders", clean)
+        assert registry.refcount("orders") == 2
+
+        # Test case: attached frame matches and shares the mapped buffer
+        attached = attach_dataset(handle)
+        print("Attached:", attached.dtypes.to_dict())
+        assert attached["price"].equals(clean["price"])
+        assert attached["product"].tolist()[:2] == ["Laptop", "Mouse"]
+        assert attached["product"].isna().tolist() == [False, False, True]
+        assert attached["quantity"].dtype == np.float64
+        assert attached["shipped"].equals(clean["shipped"])
+        assert attached["updated"].equals(clean["updated"])
+        base = attached["price"].to_numpy()
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+
+        # Test case: workers attach by dataset ID
+        with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(registry.handles(),)) as pool:
+            results = list(pool.map(_worker_checksum, ["orders"] * 4))
+        print("Workers:", results[0])
+        assert all(r[0] == results[0][0] for r in results)
+
+        # Test case: files are removed once the last reference is released
+        registry.release("orders")
+        assert os.path.exists(handle["path"])
+        registry.release("orders")
+        assert not os.path.exists(handle["path"])
+
+    print("\nAll tests passed ✓")
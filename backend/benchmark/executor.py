@@ -0,0 +1,113 @@
+"""
+Benchmark Executor
+Backend Agent: Send benchmark tasks to models and store their raw outputs
+"""
+
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmark import results_store
+from benchmark.clients import call_model, provider_for
+from benchmark.scheduler import AIMDLimiter, Budget, Scheduler
+from benchmark.tasks import build_prompt
+
+
+def load_task(store: str, task_id: str) -> Dict[str, Any]:
+    """Task spec plus its dirty CSV text"""
+    task = results_store.load_json(results_store.task_path(store, task_id))
+    with open(results_store.dirty_path(store, task_id)) as f:
+        task["dirty_csv"] = f.read()
+    return task
+
+
+def output_record(task: Dict[str, Any], model: str, run: int, reply: Dict[str, Any], seconds: float) -> Dict[str, Any]:
+    """Stored output: task metadata the scorer needs plus the raw reply"""
+    return {
+        "task_id": task["task_id"],
+        "model": model,
+        "run": run,
+        "dataset_id": task["dataset_id"],
+        "dimension": task["dimension"],
+        "difficulty": task["difficulty"],
+        "injected_row_indices": task["injected_row_indices"],
+        "protected_columns": task["protected_columns"],
+        "response": reply["text"],
+        "input_tokens": reply.get("input_tokens", 0),
+        "output_tokens": reply.get("output_tokens", 0),
+        "seconds": seconds,
+    }
+
+
+def run_tasks(
+    store: str,
+    models: List[str],
+    task_ids: Optional[List[str]] = None,
+    runs: int = 1,
+    call: Optional[Callable[[str, str], Any]] = None,
+    max_tokens: Optional[int] = None,
+    max_cost: Optional[float] = None,
+    prices: Optional[Dict[str, Tuple[float, float]]] = None,
+    max_concurrency: int = 32
+) -> Dict[str, Any]:
+    """
+    Run every (model, task, run) combination that has no stored output yet
+
+    Calls go through the adaptive scheduler: per-provider concurrency
+    follows observed throttling, every model gets covered evenly, and
+    dispatch stops before the token/cost ceiling.
+
+    Args:
+        store: Results store root
+        models: Model IDs to run
+        task_ids: Tasks to run (None = all tasks in the store)
+        runs: Repetitions per task, for reliability scoring
+        call: Function (model, prompt) -> reply dict, blocking or async;
+            defaults to the provider SDK clients
+        max_tokens / max_cost: Ceilings for this invocation (None = unlimited)
+        prices: Model ID -> (USD per 1K input, USD per 1K output tokens);
+            required for every model when max_cost is set (else ValueError)
+        max_concurrency: Upper bound for any provider's concurrency window
+
+    Returns:
+        Summary with completed, skipped, failed and remaining counts
+    """
+    call = call or call_model
+    task_ids = list(results_store.iter_task_ids(store)) if task_ids is None else task_ids
+    tasks = {task_id: load_task(store, task_id) for task_id in task_ids}
+
+    items, skipped = [], 0
+    for model in models:
+        for run in range(runs):
+            for task_id, task in tasks.items():
+                if os.path.exists(results_store.output_path(store, model, task_id, run)):
+                    skipped += 1
+                    continue
+                items.append({"model": model, "task": task, "run": run,
+                              "prompt": build_prompt(task, task["dirty_csv"])})
+
+    def save(item: Dict[str, Any], reply: Dict[str, Any], seconds: float) -> None:
+        results_store.save_output(store, output_record(item["task"], item["model"], item["run"], reply, seconds))
+
+    scheduler = Scheduler(
+        call,
+        budget=Budget(max_tokens=max_tokens, max_cost=max_cost, prices=prices, models=models),
+        limiters=_limiters(models, max_concurrency),
+        on_result=save,
+    )
+    summary = asyncio.run(scheduler.run(items))
+
+    return {
+        "completed": len(summary["completed"]),
+        "skipped": skipped,
+        "failed": summary["failed"],
+        "remaining": summary["remaining"],
+        "stopped_by_budget": summary["stopped_by_budget"],
+        "spent_tokens": summary["spent_tokens"],
+        "spent_cost": summary["spent_cost"],
+    }
+
+
+def _limiters(models: List[str], max_concurrency: int) -> Dict[str, AIMDLimiter]:
+    providers = {provider_for(model) for model in models}
+    return {p: AIMDLimiter(initial=min(2, max_concurrency), maximum=max_concurrency) for p in providers}
@@ -0,0 +1,173 @@
+"""
+Dashboard Export
+Backend Agent: Turn stored results into static files the dashboard can load
+
+Two outputs:
+    - data.json: single file in the format of docs/DATA_INTEGRATION.md
+    - bundle: versioned, content-hashed static files for a CDN / file server
+
+Bundle layout (all files except index.json are immutable):
+    index.json                            Points to the current manifest (short cache)
+    manifest.<hash>.json                  Lists every file of this version
+    rollups.<hash>.json                   Models with their 3 aggregate scores
+    dimensions.<hash>.json                Per-model dimension breakdown
+    tasks/<model>/<dataset>.<hash>.json   Per-task results, one shard per model/dataset
+                                          (IDs URL-quoted, as in the results store)
+Every JSON file is also written precompressed as <file>.gz.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from benchmark import results_parquet, results_store
+
+
+def dashboard_data(rollups: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dashboard payload in the format of docs/DATA_INTEGRATION.md (Option 3)
+
+    Operational readiness is not computed by the pipeline yet and is
+    exported as 0.0 unless a rollup provides it. Dimensions a model has no
+    tasks in are exported as null.
+    """
+    models = []
+    dimensions = {}
+    for model_id, rollup in rollups.items():
+        models.append({
+            "id": model_id,
+            "name": model_id,
+            "scores": {
+                "performance": round(rollup["scores"]["performance"], 3),
+                "safety": round(rollup["scores"]["safety"], 3),
+                "operational": round(rollup["scores"].get("operational", 0.0), 3),
+            },
+        })
+        dimensions[model_id] = {k: None if v is None else round(v, 3) for k, v in rollup["dimensions"].items()}
+
+    return {"models": models, "dimensions": dimensions}
+
+
+def export_dashboard_json(store: str, out_path: str) -> Dict[str, Any]:
+    """Write data.json for the dashboard, rolled up from the current results"""
+    data = dashboard_data(results_parquet.compute_rollups(results_store.results_dir(store)))
+    results_store.atomic_write_json(out_path, data)
+    return data
+
+
+# ============= Static Bundle =============
+
+def _round(value: Any) -> Any:
+    return round(value, 4) if isinstance(value, float) else value
+
+
+def task_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one scored result into a compact row for a task shard"""
+    metrics = result.get("metrics", {})
+    detection = metrics.get("detection", {})
+    corruption = metrics.get("corruption", {})
+    drift = metrics.get("drift", {})
+    return {
+        "task_id": result["task_id"],
+        "run": result.get("run", 0),
+        "dimension": result.get("dimension"),
+        "difficulty": result.get("difficulty"),
+        "f1": _round(detection.get("f1")),
+        "precision": _round(detection.get("precision")),
+        "recall": _round(detection.get("recall")),
+        "confusion": detection.get("support"),
+        "corruption_rate": _round(corruption.get("corruption_rate")),
+        "corruption_by_column": corruption.get("by_column"),
+        "drift_score": _round(drift.get("global_drift")),
+        "drift_by_column": {k: _round(v) for k, v in drift.get("by_column", {}).items()} or None,
+        "error": result.get("error"),
+        "seconds": _round(result.get("seconds")),
+    }
+
+
+def _write_hashed(out_dir: str, name: str, data: Any) -> str:
+    """
+    Write `data` as <name>.<hash>.json plus a .gz twin; return the relative path
+
+    Files are named after their content, so rewriting an unchanged file is a
+    no-op and a published file never changes under a cached URL.
+    """
+    body = json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    rel_path = f"{name}.{digest}.json"
+    path = os.path.join(out_dir, rel_path)
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write_bytes(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        _atomic_write_bytes(path, body)
+    return rel_path
+
+
+def _shard_name(model: str, dataset_id: str) -> str:
+    # Quoted like the results store partitions, so a '/' in a model ID
+    # stays inside one path segment
+    return f"tasks/{results_store.path_segment(model)}/{results_store.path_segment(dataset_id)}"
+
+
+def _atomic_write_bytes(path: str, body: bytes) -> None:
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def export_bundle(store: str, out_dir: str) -> Dict[str, Any]:
+    """
+    Write the static dashboard bundle for the store's current results
+
+    Shards are written first and index.json last, so a reader following
+    index.json always sees a complete version.
+
+    Args:
+        store: Results store root
+        out_dir: Bundle directory (e.g. frontend/public/bundle)
+
+    Returns:
+        The manifest that index.json now points to
+    """
+    root = results_store.results_dir(store)
+    rollups = results_parquet.compute_rollups(root)
+    dashboard = dashboard_data(rollups)
+
+    # One shard per (model, dataset); each read touches only its partitions
+    pairs = results_parquet.read_table(root, columns=["model", "dataset_id"])
+    shards: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for model, dataset_id in sorted(set(zip(pairs["model"].to_pylist(), pairs["dataset_id"].to_pylist()))):
+        rows = [task_row(result) for result in results_parquet.task_rows(root, model, dataset_id)]
+        shards.setdefault(model, {})[dataset_id] = rows
+
+    manifest = {
+        "rollups": _write_hashed(out_dir, "rollups", {
+            "models": dashboard["models"],
+            "totals": {model: {k: rollup[k] for k in ("tasks", "scored", "errors")}
+                       for model, rollup in rollups.items()},
+        }),
+        "dimensions": _write_hashed(out_dir, "dimensions", dashboard["dimensions"]),
+        "shards": {
+            model: {
+                dataset_id: _write_hashed(
+                    out_dir, _shard_name(model, dataset_id),
+                    sorted(rows, key=lambda r: (r["task_id"], r["run"]))
+                )
+                for dataset_id, rows in sorted(datasets.items())
+            }
+            for model, datasets in sorted(shards.items())
+        },
+    }
+    manifest_path = _write_hashed(out_dir, "manifest", manifest)
+    version = manifest_path.split(".")[-2]
+
+    index = {"version": version, "manifest": manifest_path}
+    body = json.dumps(index, separators=(",", ":")).encode()
+    _atomic_write_bytes(os.path.join(out_dir, "index.json.gz"), gzip.compress(body, mtime=0))
+    _atomic_write_bytes(os.path.join(out_dir, "index.json"), body)
+
+    return {"version": version, **manifest}
@@ -0,0 +1,211 @@
+"""
+Fake Throttling Model Server
+Backend Agent: Local stand-in for a provider API to exercise the scheduler
+
+The server accepts POST /v1/complete with {"model", "prompt"} and echoes
+the CSV block of the prompt back as the "cleaned" dataset. It serves at
+most `capacity` requests at once and answers anything beyond that with
+429 + Retry-After, like a provider's concurrency limit. Latency grows with
+the prompt size. Standard library only.
+
+Usage (from backend/):
+    python -m benchmark.fake_server
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Dict, Optional
+
+from benchmark.scheduler import RateLimited
+
+
+class FakeModelServer:
+    """
+    Throttling HTTP server on localhost
+
+    Args:
+        capacity: Concurrent requests served before answering 429
+        latency: Base seconds per request
+        seconds_per_1k_tokens: Extra latency per 1K prompt tokens
+        retry_after: Seconds advertised in the Retry-After header
+    """
+
+    def __init__(self, capacity: int = 4, latency: float = 0.02,
+                 seconds_per_1k_tokens: float = 0.01, retry_after: float = 0.05):
+        self.capacity = capacity
+        self.latency = latency
+        self.seconds_per_1k_tokens = seconds_per_1k_tokens
+        self.retry_after = retry_after
+        self.active = 0
+        self.peak_active = 0
+        self.served = 0
+        self.throttled = 0
+        self.port: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1/complete"
+
+    async def start(self) -> "FakeModelServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "FakeModelServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            body = await _read_request(reader)
+            if self.active >= self.capacity:
+                self.throttled += 1
+                await _write_response(writer, 429, {"error": "rate_limited"},
+                                      {"Retry-After": str(self.retry_after)})
+                return
+
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            try:
+                request = json.loads(body)
+                prompt = request["prompt"]
+                input_tokens = len(prompt) // 4
+                await asyncio.sleep(self.latency + self.seconds_per_1k_tokens * input_tokens / 1000)
+                match = re.search(r"```csv\n(.*?)```", prompt, re.S)
+                text = f"```csv\n{match.group(1) if match else ''}```"
+                self.served += 1
+                await _write_response(writer, 200, {
+                    "text": text,
+                    "input_tokens": input_tokens,
+                    "output_tokens": len(text) // 4,
+                })
+            finally:
+                self.active -= 1
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> bytes:
+    headers = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in headers.decode("latin-1").split("\r\n"):
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    return await reader.readexactly(length)
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                          headers: Optional[Dict[str, str]] = None) -> None:
+    body = json.dumps(payload).encode()
+    reason = {200: "OK", 429: "Too Many Requests"}.get(status, "Error")
+    lines = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json",
+             f"Content-Length: {len(body)}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+
+def fake_client(url: str):
+    """
+    Async call function for the Scheduler that talks to a FakeModelServer
+
+    Raises RateLimited on 429 so the scheduler backs off.
+    """
+    host, port = re.match(r"http://([^:/]+):(\d+)", url).groups()
+    path = url.split(f":{port}", 1)[1]
+
+    async def call(model: str, prompt: str) -> Dict[str, Any]:
+        reader, writer = await asyncio.open_connection(host, int(port))
+        try:
+            body = json.dumps({"model": model, "prompt": prompt}).encode()
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, payload = raw.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        if status == 429:
+            headers = {k.strip().lower(): v.strip() for k, _, v in (l.partition(":") for l in lines[1:])}
+            raise RateLimited(retry_after=float(headers.get("retry-after", 0.1)))
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        return json.loads(payload)
+
+    return call
+
+
+# Example usage
+if __name__ == "__main__":
+    from benchmark.scheduler import AIMDLimiter, Budget, Scheduler
+
+    def make_items(models, n_tasks, runs):
+        items = []
+        for model in models:
+            for run in range(runs):
+                for i in range(n_tasks):
+                    task = {
+                        "task_id": f"ds{i % 3}_{['accuracy', 'completeness', 'consistency', 'uniqueness'][i % 4]}_{i}",
+                        "dataset_id": f"ds{i % 3}",
+                        "dimension": ["accuracy", "completeness", "consistency", "uniqueness"][i % 4],
+                        "dirty_csv": "id,value\n" + "\n".join(f"{r},{r * 1.5}" for r in range(200)),
+                    }
+                    items.append({"model": model, "task": task, "run": run,
+                                  "prompt": f"Clean this:\n```csv\n{task['dirty_csv']}\n```\n"})
+        return items
+
+    async def main():
+        async with FakeModelServer(capacity=4) as server:
+            # Test case: adapts to the server's concurrency limit
+            scheduler = Scheduler(
+                fake_client(server.url),
+                limiters={"fake": AIMDLimiter(initial=2, maximum=16)},
+                provider_of=lambda model: "fake",
+            )
+            summary = await scheduler.run(make_items(["model-a", "model-b"], 24, 2))
+            print(f"Served {server.served}, throttled {server.throttled}, peak concurrency "
+                  f"{server.peak_active}, limits {summary['limits']}")
+            assert len(summary["completed"]) == 96 and not summary["failed"]
+            assert server.peak_active <= server.capacity
+            assert summary["limits"]["fake"]["peak"] > 2
+
+            # Test case: stops cleanly at the token ceiling, models covered evenly
+            items = make_items(["model-a", "model-b"], 24, 1)
+            ceiling = 20 * (len(items[0]["prompt"]) // 4 + len(items[0]["task"]["dirty_csv"]) // 4 + 16)
+            scheduler = Scheduler(
+                fake_client(server.url),
+                budget=Budget(max_tokens=ceiling),
+                limiters={"fake": AIMDLimiter(initial=2, maximum=16)},
+                provider_of=lambda model: "fake",
+            )
+            summary = await scheduler.run(items)
+            print(f"Budget stop: {summary['coverage']}, spent {summary['spent_tokens']}/{ceiling} tokens")
+            assert summary["stopped_by_budget"]
+            assert summary["spent_tokens"] <= ceiling
+            assert abs(summary["coverage"]["model-a"] - summary["coverage"]["model-b"]) <= 1
+
+    # Test case: a cost ceiling without a price for every model is refused
+    for prices in [None, {"model-a": (0.001, 0.002)}]:
+        try:
+            Budget(max_cost=1.0, prices=prices, models=["model-a", "model-b"])
+            raise AssertionError("unpriced model accepted")
+        except ValueError as e:
+            print(f"Refused: {e}")
+
+    asyncio.run(main())
+    print("\nAll tests passed ✓")
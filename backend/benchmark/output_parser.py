@@ -0,0 +1,571 @@
+"""
+Streaming Agent Output Parser
+Backend Agent: Turn raw model responses into typed DataFrames for scoring
+"""
+
+import csv
+import json
+import re
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Bump whenever parsing behavior changes (what a response turns into);
+# every stored result parsed by another version is then re-scored
+PARSER_VERSION = 1
+
+# Cell values that count as missing in non-text columns; in text columns
+# only the empty string does, since "NA" or "-" can be real values
+NULL_TOKENS = {"", "na", "n/a", "nan", "null", "none", "nat", "-"}
+
+TRUE_TOKENS = {"true", "t", "yes", "y", "1"}
+FALSE_TOKENS = {"false", "f", "no", "n", "0"}
+
+_MARKDOWN_SEPARATOR = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+_UNESCAPED_PIPE = re.compile(r"(?<!\\)\|")
+
+
+# ============= Cell Coercion =============
+
+def _is_null(value: Any, text: bool = False) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        token = value.strip().strip('"')
+        return token == "" if text else token.lower() in NULL_TOKENS
+    if isinstance(value, float):
+        return np.isnan(value)
+    return False
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    token = str(value).strip().strip('"').lower()
+    if token in TRUE_TOKENS:
+        return True
+    if token in FALSE_TOKENS:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, (bool, np.bool_)):
+        raise ValueError(f"not an integer: {value!r}")
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    token = str(value).strip().strip('"')
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    # "1001.0", "1e3": Decimal keeps IDs above 2**53 exact, unlike float
+    try:
+        number = Decimal(token)
+    except InvalidOperation:
+        raise ValueError(f"not an integer: {value!r}") from None
+    if not number.is_finite() or number != number.to_integral_value():
+        raise ValueError(f"not an integer: {value!r}")
+    return int(number)
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, (bool, np.bool_)):
+        raise ValueError(f"not a number: {value!r}")
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return float(str(value).strip().strip('"'))
+
+
+def _to_datetime(value: Any, tz=None) -> pd.Timestamp:
+    timestamp = pd.Timestamp(str(value).strip().strip('"'))
+    if pd.isna(timestamp):
+        raise ValueError(f"not a timestamp: {value!r}")
+    # Match the column's timezone: naive values are taken as local to it,
+    # aware values are converted (to UTC wall time for naive columns)
+    if tz is not None:
+        return timestamp.tz_localize(tz) if timestamp.tzinfo is None else timestamp.tz_convert(tz)
+    if timestamp.tzinfo is not None:
+        return timestamp.tz_convert(None)
+    return timestamp
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    return str(value)
+
+
+def _coercer_for(dtype) -> Callable[[Any], Any]:
+    """Pick the cell converter matching a column dtype of the clean dataset"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return _to_bool
+    if pd.api.types.is_integer_dtype(dtype):
+        return _to_int
+    if pd.api.types.is_float_dtype(dtype):
+        return _to_float
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return partial(_to_datetime, tz=getattr(dtype, "tz", None))
+    return _to_text
+
+
+def _build_column(values: List[Any], dtype):
+    """
+    Materialize one coerced column with the original dtype
+
+    Integer columns with missing values fall back to float64 and boolean
+    columns to object, mirroring what pandas.read_csv would produce.
+    """
+    has_missing = any(v is None for v in values)
+
+    if pd.api.types.is_bool_dtype(dtype):
+        if has_missing:
+            return np.array([np.nan if v is None else v for v in values], dtype=object)
+        return np.array(values, dtype=bool)
+    if pd.api.types.is_integer_dtype(dtype):
+        if has_missing:
+            return np.array([np.nan if v is None else v for v in values], dtype="float64")
+        return np.array(values, dtype=dtype)
+    if pd.api.types.is_float_dtype(dtype):
+        return np.array([np.nan if v is None else v for v in values], dtype=dtype)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        stamps = [pd.NaT if v is None else v for v in values]
+        return pd.DatetimeIndex(stamps, tz=getattr(dtype, "tz", None)).astype(dtype)
+    return np.array([np.nan if v is None else v for v in values], dtype=object)
+
+
+def _ends_in_quoted_field(record: str) -> bool:
+    """
+    Whether a CSV record ends inside a quoted field
+
+    Only a field that starts with a quote is quoted; a quote inside an
+    unquoted field (27" Monitor) is a literal character, as in csv.reader.
+    """
+    quoted = False
+    field_start = True
+    i = 0
+    while i < len(record):
+        char = record[i]
+        if quoted:
+            if char == '"':
+                if record[i + 1:i + 2] == '"':
+                    i += 1  # Escaped quote
+                else:
+                    quoted = False
+        elif char == ",":
+            field_start = True
+        elif field_start and char == '"':
+            quoted = True
+            field_start = False
+        elif not (field_start and char in " \t"):
+            field_start = False
+        i += 1
+    return quoted
+
+
+# ============= Streaming Parser =============
+
+class StreamingResponseParser:
+    """
+    Incrementally parse a model response into a DataFrame typed like the source
+
+    Feed response chunks as they arrive (any split, even mid-line). Each
+    complete row is coerced cell-by-cell to the dtypes of `schema_df`, so no
+    intermediate all-string DataFrame is ever built. Call `finish()` once the
+    stream ends to get the typed DataFrame and the malformed-row report.
+
+    Supported formats: CSV, markdown tables, JSON arrays of objects and JSON
+    lines. Surrounding prose and ``` code fences are ignored.
+
+    Rows that cannot be split into the expected fields (wrong field count,
+    invalid JSON) are dropped. Rows with individual cells that fail dtype
+    coercion are kept with the cell set to missing, so positional alignment
+    with the clean dataset is preserved. Both kinds are listed in the report.
+    """
+
+    def __init__(self, schema_df: pd.DataFrame, fmt: str = "auto"):
+        if fmt not in ("auto", "csv", "markdown", "json"):
+            raise ValueError(f"Unknown response format: {fmt}")
+
+        self.columns = schema_df.columns.tolist()
+        self.dtypes = schema_df.dtypes.to_dict()
+        self.format = None if fmt == "auto" else fmt
+
+        self._coercers = {col: _coercer_for(dtype) for col, dtype in self.dtypes.items()}
+        self._text_columns = {col for col, coercer in self._coercers.items() if coercer is _to_text}
+        self._buffers: Dict[str, List[Any]] = {col: [] for col in self.columns}
+        self._header: Optional[List[str]] = None
+        self._pending: List[str] = []  # Pieces of the current, unfinished line
+        self._streaming_line: Optional[bool] = None  # Whether that line goes to the JSON decoder early
+        self._record = ""
+        self._record_line = 0
+        self._json_buffer = ""
+        self._json_line = 0
+        self._line_no = 0
+        self._rows = 0
+        self._in_fence = False
+        self._data_in_fence = False
+        self._expect_separator = False
+        self._data_ended = False  # Closing fence after the data: ignore the rest
+        self._finished = False
+        self.malformed_rows: List[Dict[str, Any]] = []
+
+    # ----- public API -----
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of the response stream"""
+        if self._finished:
+            raise RuntimeError("Parser already finished")
+        if self._data_ended:
+            return
+
+        # Only the new chunk is searched for line breaks
+        *lines, tail = chunk.split("\n")
+        if lines:
+            lines[0] = "".join(self._pending) + lines[0]
+            self._pending = []
+            for line in lines:
+                self._consume_line(line)
+        if tail and not self._data_ended:
+            self._pending.append(tail)
+            if self.format in (None, "json"):
+                self._stream_json_line()
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Flush the stream and build the typed DataFrame
+
+        Returns:
+            Dictionary with the parsed dataframe, the detected format, the
+            malformed-row report and schema columns absent from the response
+        """
+        if not self._finished:
+            if self._pending or self._streaming_line:
+                self._consume_line("".join(self._pending))
+                self._pending = []
+            if self._record:
+                self._report(self._record_line, self._record, "unterminated quoted field")
+                self._record = ""
+            if self._json_buffer.strip().strip("]").strip():
+                self._report(self._json_line, self._json_buffer.strip(), "truncated JSON")
+            self._finished = True
+
+        data = {col: _build_column(self._buffers[col], self.dtypes[col]) for col in self.columns}
+        df = pd.DataFrame(data, columns=self.columns)
+        for col, dtype in self.dtypes.items():
+            if isinstance(dtype, pd.StringDtype):
+                df[col] = df[col].astype(dtype)
+
+        missing = [col for col in self.columns if self._header is not None and col not in self._header]
+
+        return {
+            "dataframe": df,
+            "format": self.format,
+            "malformed_rows": self.malformed_rows,
+            "missing_columns": missing,
+        }
+
+    # ----- line handling -----
+
+    def _consume_line(self, line: str) -> None:
+        self._line_no += 1
+        line = line.rstrip("\r")
+        if self._data_ended:
+            return
+
+        if self._streaming_line:
+            # The start of this line was already decoded as it arrived
+            self._streaming_line = None
+            self._consume_json(line + "\n", self._line_no)
+            return
+        self._streaming_line = None
+
+        if line.strip().startswith("```"):
+            self._in_fence = not self._in_fence
+            # Data that started inside a code block ends with it; closing
+            # remarks after the fence are prose, even if they look like rows
+            if not self._in_fence and self._data_in_fence:
+                self._data_ended = True
+            return
+
+        if self.format is None:
+            self.format = self._detect_format(line)
+            if self.format is None:
+                return  # Preamble prose before the data starts
+
+        if self.format == "json":
+            self._consume_json(line + "\n", self._line_no)
+        elif self.format == "markdown":
+            self._consume_markdown(line)
+        else:
+            self._consume_csv(line)
+
+        if self._in_fence and (self._header is not None or self._rows):
+            self._data_in_fence = True
+
+    def _detect_format(self, line: str) -> Optional[str]:
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            return "markdown"
+        if stripped.startswith("[") or stripped.startswith("{"):
+            return "json"
+        if self._parse_header(next(csv.reader([stripped]), [])) is not None:
+            return "csv"
+        return None
+
+    def _parse_header(self, fields: List[str]) -> Optional[List[str]]:
+        header = [f.strip().strip('"') for f in fields]
+        if header and set(header) & set(self.columns) and len(set(header)) == len(header):
+            return header
+        return None
+
+    # ----- CSV -----
+
+    def _consume_csv(self, line: str) -> None:
+        if not self._record:
+            self._record_line = self._line_no
+            if not line.strip():
+                return
+        self._record = f"{self._record}\n{line}" if self._record else line
+
+        # A quoted field spanning lines keeps the record open
+        if _ends_in_quoted_field(self._record):
+            return
+
+        record, self._record = self._record, ""
+        fields = next(csv.reader([record], skipinitialspace=True), [])
+        if self._header is None:
+            self._header = self._parse_header(fields)
+            if self._header is None:
+                self._report(self._record_line, record, "missing header row")
+            return
+        self._add_fields(fields, record, self._record_line)
+
+    # ----- Markdown -----
+
+    def _consume_markdown(self, line: str) -> None:
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            return  # Prose around the table
+        if self._expect_separator:
+            self._expect_separator = False
+            if _MARKDOWN_SEPARATOR.match(stripped):
+                return
+
+        cells = _UNESCAPED_PIPE.split(stripped.strip("|"))
+        fields = [cell.strip().replace("\\|", "|") for cell in cells]
+        if self._header is None:
+            self._header = self._parse_header(fields)
+            if self._header is None:
+                self._report(self._line_no, line, "missing header row")
+            else:
+                self._expect_separator = True
+            return
+        self._add_fields(fields, line, self._line_no)
+
+    # ----- JSON -----
+
+    def _stream_json_line(self) -> None:
+        """
+        Decode complete objects from a line that has not ended yet
+
+        Single-line JSON arrays would otherwise yield no rows until the
+        stream ends. Whether a line is payload is decided from its first
+        non-blank character; prose and code fences wait for the line break.
+        """
+        if self._streaming_line is False:
+            return
+        text = "".join(self._pending)
+        if self._streaming_line is None:
+            start = text.lstrip()[:1]
+            if not start:
+                return
+            if self.format is None and start in "[{":
+                self.format = "json"
+            if self.format != "json" or (not self._json_buffer.strip() and start not in "[]{},"):
+                self._streaming_line = False
+                return
+            self._streaming_line = True
+        self._pending = []
+        self._consume_json(text, self._line_no + 1, partial_line=True)
+
+    def _consume_json(self, text: str, line_no: int, partial_line: bool = False) -> None:
+        if not self._json_buffer.strip():
+            if text.strip() and text.strip()[0] not in "[]{},":
+                return  # Prose around the JSON payload
+            self._json_line = line_no
+        self._json_buffer += text
+
+        decoder = json.JSONDecoder()
+        buffer = self._json_buffer
+        pos = 0
+        while True:
+            # Skip array punctuation between objects
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as err:
+                if partial_line or err.pos >= len(buffer.rstrip()):
+                    break  # Object still incomplete, wait for more input
+                # Invalid content: drop through the end of the offending line
+                newline = buffer.find("\n", err.pos)
+                cut = len(buffer) if newline == -1 else newline + 1
+                self._report(self._json_line, buffer[pos:cut].strip(), "invalid JSON")
+                pos = cut
+                self._json_line = line_no
+                continue
+            self._add_object(obj, buffer[pos:end], self._json_line)
+            pos = end
+            self._json_line = line_no
+
+        self._json_buffer = buffer[pos:]
+
+    def _add_object(self, obj: Any, raw: str, line_no: int) -> None:
+        if not isinstance(obj, dict):
+            self._report(line_no, raw, "expected a JSON object per row")
+            return
+        if self._header is None:
+            self._header = list(obj.keys())
+        self._add_row([obj.get(col) for col in self.columns], raw, line_no, present=set(obj))
+
+    # ----- row assembly -----
+
+    def _add_fields(self, fields: List[str], raw: str, line_no: int) -> None:
+        if len(fields) != len(self._header):
+            self._report(
+                line_no, raw,
+                f"expected {len(self._header)} fields, got {len(fields)}"
+            )
+            return
+        by_name = dict(zip(self._header, fields))
+        self._add_row([by_name.get(col) for col in self.columns], raw, line_no, present=set(by_name))
+
+    def _add_row(self, values: List[Any], raw: str, line_no: int, present: set) -> None:
+        errors = []
+        coerced = []
+        for col, value in zip(self.columns, values):
+            if col not in present or _is_null(value, text=col in self._text_columns):
+                coerced.append(None)
+                continue
+            try:
+                coerced.append(self._coercers[col](value))
+            except (TypeError, ValueError, OverflowError):
+                errors.append(f"column '{col}': cannot convert {value!r} to {self.dtypes[col]}")
+                coerced.append(None)
+
+        for col, value in zip(self.columns, coerced):
+            self._buffers[col].append(value)
+
+        if errors:
+            self._report(line_no, raw, "; ".join(errors), row=self._rows)
+        self._rows += 1
+
+    def _report(self, line_no: int, raw: str, reason: str, row: Optional[int] = None) -> None:
+        self.malformed_rows.append({
+            "line": line_no,
+            "row": row,  # Position in the output DataFrame, None if dropped
+            "raw": raw,
+            "reason": reason,
+        })
+
+
+def parse_agent_response(
+    response: Any,
+    schema_df: pd.DataFrame,
+    fmt: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Parse a complete or chunked agent response against the clean dataset schema
+
+    Args:
+        response: Full response text, or an iterable of text chunks
+        schema_df: Clean dataset whose columns and dtypes define the target schema
+        fmt: "auto", "csv", "markdown" or "json"
+
+    Returns:
+        Dictionary with the typed dataframe and malformed-row report
+        (see StreamingResponseParser.finish)
+    """
+    parser = StreamingResponseParser(schema_df, fmt=fmt)
+    chunks: Iterable[str] = [response] if isinstance(response, str) else response
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
+
+
+# Example usage
+if __name__ == "__main__":
+    clean = pd.DataFrame({
+        "order_id": [1001, 1002, 1003],
+        "product": ["Laptop", "Mouse", "Keyboard"],
+        "price": [999.99, 29.99, 79.99],
+    })
+
+    # Test case: CSV streamed in awkward chunks, numbers quoted as strings
+    response = (
+        "Here is the cleaned data:\n```csv\n"
+        "order_id,product,price\n"
+        "1001,Laptop,\"999.99\"\n"
+        "1002,Mouse,29.99\n"
+        "1003,Keyboard,79.99\n```\n"
+    )
+    chunks = [response[i:i + 7] for i in range(0, len(response), 7)]
+    result = parse_agent_response(chunks, clean)
+    print("CSV:", result["format"], result["dataframe"].dtypes.to_dict())
+    assert result["dataframe"].equals(clean)
+    assert result["malformed_rows"] == []
+
+    # Test case: markdown table with a bad cell and a broken row
+    response = (
+        "| order_id | product | price |\n"
+        "|---|---|---|\n"
+        "| 1001 | Laptop | 999.99 |\n"
+        "| 1002 | Mouse | abc |\n"
+        "| 1003 | Keyboard |\n"
+    )
+    result = parse_agent_response(response, clean)
+    print("Markdown:", result["malformed_rows"])
+    assert len(result["dataframe"]) == 2
+    assert np.isnan(result["dataframe"].loc[1, "price"])
+    assert [r["row"] for r in result["malformed_rows"]] == [1, None]
+
+    # Test case: JSON array split mid-object
+    response = json.dumps([
+        {"order_id": "1001", "product": "Laptop", "price": "999.99"},
+        {"order_id": 1002, "product": "Mouse", "price": 29.99},
+        {"order_id": 1003, "product": "Keyboard", "price": 79.99},
+    ], indent=2)
+    result = parse_agent_response([response[:40], response[40:95], response[95:]], clean)
+    print("JSON:", result["format"], len(result["dataframe"]))
+    assert result["dataframe"].equals(clean)
+
+    # Test case: literal quote in an unquoted field, multi-line quoted field
+    response = (
+        "order_id,product,price\n"
+        "1001,27\" Monitor,999.99\n"
+        "1002,\"Mouse\nwireless\",29.99\n"
+        "1003,Keyboard,79.99\n"
+    )
+    result = parse_agent_response(response, clean)
+    print("Quotes:", result["dataframe"]["product"].tolist())
+    assert result["dataframe"]["product"].tolist() == ['27" Monitor', "Mouse\nwireless", "Keyboard"]
+    assert result["malformed_rows"] == []
+
+    # Test case: closing remark after the fenced data is not a row
+    response = "```csv\norder_id,product,price\n1001,Laptop,999.99\n```\nChanged rows: 3, 7, 12\n"
+    result = parse_agent_response(response, clean)
+    assert len(result["dataframe"]) == 1 and result["malformed_rows"] == []
+
+    # Test case: short GFM separator, integers above 2**53
+    big = pd.DataFrame({"id": [12345678901234567, 2], "name": ["a", "b"]})
+    result = parse_agent_response("| id | name |\n|:-:|:-|\n| 12345678901234567 | a |\n| 2.0 | b |\n", big)
+    assert result["dataframe"].equals(big), result
+
+    print("\nAll tests passed ✓")
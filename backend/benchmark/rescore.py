@@ -0,0 +1,168 @@
+"""
+Offline Re-scoring Pipeline
+Backend Agent: Recompute changed metrics over stored agent outputs, no API calls
+
+Usage (from backend/):
+    python -m benchmark rescore --store ../results
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from benchmark import results_parquet, results_store
+from benchmark.dataset_registry import DatasetRegistry, get_dataset, init_worker
+from benchmark.scoring import METRICS, score_output, stale_metrics
+
+
+# ============= Planning =============
+
+def _key(result: Dict[str, Any]) -> Tuple[str, str, int]:
+    return result["model"], result["task_id"], result.get("run", 0)
+
+
+def plan_rescore(store: str, force: bool = False) -> List[Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]]:
+    """
+    Find stored outputs whose results are missing or out of date
+
+    Staleness is decided from the stored metric versions alone; full
+    results are read only for the partitions of outputs that keep some of
+    their metrics (the rest are carried over from the existing result).
+
+    Args:
+        store: Results store root
+        force: Recompute every metric regardless of stored versions
+
+    Returns:
+        List of (output record, metric names to recompute, existing result)
+    """
+    root = results_store.results_dir(store)
+    table = results_parquet.read_table(root, columns=["model", "task_id", "run", "metric_versions"])
+    stored = {_key(row): {"metric_versions": dict(row["metric_versions"] or [])} for row in table.to_pylist()}
+
+    planned, partitions = [], set()
+    for path in results_store.iter_output_paths(store):
+        record = results_store.load_json(path)
+        names = list(METRICS) if force else stale_metrics(stored.get(_key(record)))
+        if not names:
+            continue
+        planned.append((record, names))
+        if _key(record) in stored and len(names) < len(METRICS):
+            partitions.add((record["model"], record["dataset_id"]))
+
+    existing = {}
+    for model, dataset_id in sorted(partitions):
+        existing.update((_key(result), result) for result in results_parquet.task_rows(root, model, dataset_id))
+    return [(record, names, existing.get(_key(record))) for record, names in planned]
+
+
+# ============= Worker =============
+
+def _rescore_one(record: Dict[str, Any], names: List[str], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Runs in a pool worker: score one output against the shared clean dataset"""
+    original_df = get_dataset(record["dataset_id"])
+    try:
+        return score_output(record, original_df, metrics=names, previous=previous)
+    except Exception as e:
+        result = score_output(record, original_df, metrics=[], previous=previous)
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+
+# ============= Pipeline =============
+
+def rescore(store: str, workers: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Re-score stored agent outputs whose metric versions changed
+
+    Each clean dataset is loaded once into a shared registry; workers attach
+    to it by dataset ID. New results are written partition by partition
+    (each swapped in atomically), then the rollups are rewritten.
+
+    Args:
+        store: Results store root
+        workers: Process pool size (None = CPU count)
+        force: Recompute every metric for every output
+
+    Returns:
+        Summary with counts of planned, rescored and failed outputs
+    """
+    start = time.perf_counter()
+    plan = plan_rescore(store, force=force)
+
+    results = []
+    if plan:
+        with DatasetRegistry() as registry:
+            for dataset_id in sorted({record["dataset_id"] for record, _, _ in plan}):
+                clean = pd.read_csv(results_store.dataset_path(store, dataset_id))
+                registry.register(dataset_id, clean)
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(registry.handles(),)
+            ) as pool:
+                futures = [pool.submit(_rescore_one, record, names, previous) for record, names, previous in plan]
+                for future in as_completed(futures):
+                    results.append(future.result())
+
+        results_parquet.write_results(results_store.results_dir(store), results)
+
+    rollups = results_store.write_rollups(store)
+    failed = [{"task_id": r["task_id"], "model": r["model"], "error": r["error"]} for r in results if r["error"]]
+
+    return {
+        "planned": len(plan),
+        "rescored": len(plan) - len(failed),
+        "failed": failed,
+        "models": sorted(rollups),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from benchmark.output_parser import PARSER_VERSION
+    from benchmark.scoring import PARSER_KEY
+
+    clean = pd.DataFrame({"id": [1, 2, 3, 4], "price": [9.5, 3.0, 7.25, 1.0]})
+    task = {"dataset_id": "orders", "dimension": "accuracy", "difficulty": "easy",
+            "injected_row_indices": [1], "protected_columns": ["id"]}
+
+    with tempfile.TemporaryDirectory() as store:
+        os.makedirs(os.path.dirname(results_store.dataset_path(store, "orders")))
+        clean.to_csv(results_store.dataset_path(store, "orders"), index=False)
+        for model, response in [("gpt-5.1", clean.to_csv(index=False)), ("claude-4", "no table here")]:
+            results_store.save_output(store, {**task, "task_id": "orders_accuracy_easy", "model": model,
+                                              "run": 0, "response": f"```csv\n{response}```"})
+
+        # Test case: new outputs are scored, failures reported
+        summary = rescore(store, workers=2)
+        print(f"First pass: {summary['rescored']}/{summary['planned']}, failed {summary['failed']}")
+        assert summary["planned"] == 2 and summary["rescored"] == 1 and len(summary["failed"]) == 1
+
+        # Test case: nothing is stale on a second pass
+        assert plan_rescore(store) == []
+
+        # Test case: a bumped metric is recomputed alone, others carried over
+        root = results_store.results_dir(store)
+        result = results_parquet.task_rows(root, "gpt-5.1", "orders")[0]
+        result["metric_versions"]["drift"] = 0
+        results_parquet.write_results(root, [result])
+        plan = plan_rescore(store)
+        assert [(record["model"], names) for record, names, _ in plan] == [("gpt-5.1", ["drift"])]
+        assert plan[0][2]["metrics"]["detection"] == result["metrics"]["detection"]
+
+        # Test case: another parser version makes every metric stale
+        result["metric_versions"][PARSER_KEY] = PARSER_VERSION - 1
+        results_parquet.write_results(root, [result])
+        plan = plan_rescore(store)
+        assert [names for _, names, previous in plan] == [list(METRICS)] and plan[0][2] is None
+        assert len(plan_rescore(store, force=True)) == 2
+
+    print("\nAll tests passed ✓")
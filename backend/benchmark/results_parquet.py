@@ -0,0 +1,431 @@
+"""
+Columnar Results Format
+Backend Agent: Typed, partitioned Parquet storage for per-task results
+
+Results live under <store>/results/ as a hive-partitioned Parquet dataset:
+    model=<model>/dimension=<dimension>/dataset_id=<dataset>/part-0.parquet
+
+Queries go through pyarrow.dataset, so a filter on model/dimension/dataset
+only opens the matching partition directories and only the requested
+columns are read from each file.
+
+Self-test (from backend/):
+    python -m benchmark.results_parquet
+"""
+
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from benchmark.results_store import path_segment
+
+
+DIMENSIONS = ["accuracy", "completeness", "consistency", "uniqueness"]
+
+PARTITION_COLUMNS = ["model", "dimension", "dataset_id"]
+
+PARTITION_SCHEMA = pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS])
+
+# Columns stored inside each partition file
+FILE_SCHEMA = pa.schema([
+    ("task_id", pa.string()),
+    ("run", pa.int32()),
+    ("difficulty", pa.string()),
+    # detection
+    ("tp", pa.int64()),
+    ("fp", pa.int64()),
+    ("tn", pa.int64()),
+    ("fn", pa.int64()),
+    ("f1", pa.float64()),
+    ("precision", pa.float64()),
+    ("recall", pa.float64()),
+    ("specificity", pa.float64()),
+    ("true_positive_rate", pa.float64()),
+    ("false_positive_rate", pa.float64()),
+    # corruption
+    ("corruption_rate", pa.float64()),
+    ("edits_in_protected", pa.int64()),
+    ("total_injected_rows", pa.int64()),
+    ("protected_columns_affected", pa.list_(pa.string())),
+    ("corruption_by_column", pa.map_(pa.string(), pa.int64())),
+    # drift
+    ("global_drift", pa.float64()),
+    ("drift_by_column", pa.map_(pa.string(), pa.float64())),
+    # bookkeeping
+    ("metric_versions", pa.map_(pa.string(), pa.int32())),
+    ("parse_format", pa.string()),
+    ("malformed_rows", pa.int32()),
+    ("missing_columns", pa.list_(pa.string())),
+    ("error", pa.string()),
+    # timings and usage of the model call
+    ("seconds", pa.float64()),
+    ("input_tokens", pa.int64()),
+    ("output_tokens", pa.int64()),
+])
+
+SCHEMA = pa.schema(list(PARTITION_SCHEMA) + list(FILE_SCHEMA))
+
+
+# ============= Row Conversion =============
+
+def _map(value: Optional[Dict[str, Any]]) -> Optional[List[Tuple[str, Any]]]:
+    return None if value is None else list(value.items())
+
+
+def flatten_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Scored result (see scoring.score_output) -> one typed row"""
+    metrics = result.get("metrics", {})
+    detection = metrics.get("detection")
+    corruption = metrics.get("corruption")
+    drift = metrics.get("drift")
+    support = detection["support"] if detection else {}
+    parse = result.get("parse") or {}
+
+    return {
+        "model": result["model"],
+        "dimension": result["dimension"],
+        "dataset_id": result["dataset_id"],
+        "task_id": result["task_id"],
+        "run": result.get("run", 0),
+        "difficulty": result.get("difficulty"),
+        "tp": support.get("tp"),
+        "fp": support.get("fp"),
+        "tn": support.get("tn"),
+        "fn": support.get("fn"),
+        "f1": detection["f1"] if detection else None,
+        "precision": detection["precision"] if detection else None,
+        "recall": detection["recall"] if detection else None,
+        "specificity": detection["specificity"] if detection else None,
+        "true_positive_rate": detection["true_positive_rate"] if detection else None,
+        "false_positive_rate": detection["false_positive_rate"] if detection else None,
+        "corruption_rate": corruption["corruption_rate"] if corruption else None,
+        "edits_in_protected": corruption["edits_in_protected"] if corruption else None,
+        "total_injected_rows": corruption["total_injected_rows"] if corruption else None,
+        "protected_columns_affected": corruption["protected_columns_affected"] if corruption else None,
+        "corruption_by_column": _map(corruption.get("by_column")) if corruption else None,
+        "global_drift": drift["global_drift"] if drift else None,
+        "drift_by_column": _map(drift["by_column"]) if drift else None,
+        "metric_versions": _map(result.get("metric_versions", {})),
+        "parse_format": parse.get("format"),
+        "malformed_rows": parse.get("malformed_rows"),
+        "missing_columns": parse.get("missing_columns"),
+        "error": result.get("error"),
+        "seconds": result.get("seconds"),
+        "input_tokens": result.get("input_tokens"),
+        "output_tokens": result.get("output_tokens"),
+    }
+
+
+def _dict(value: Optional[List[Tuple[str, Any]]]) -> Optional[Dict[str, Any]]:
+    return None if value is None else dict(value)
+
+
+def row_to_result(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed row -> scored result in the shape scoring.score_output produces"""
+    metrics = {}
+    if row.get("tp") is not None:
+        # Stored values as computed by the metric version that wrote them
+        metrics["detection"] = {
+            "f1": row["f1"],
+            "precision": row["precision"],
+            "recall": row["recall"],
+            "specificity": row["specificity"],
+            "true_positive_rate": row.get("true_positive_rate"),
+            "false_positive_rate": row.get("false_positive_rate"),
+            "support": {"tp": row["tp"], "fp": row["fp"], "tn": row["tn"], "fn": row["fn"]},
+        }
+    if row.get("corruption_rate") is not None:
+        metrics["corruption"] = {
+            "corruption_rate": row["corruption_rate"],
+            "edits_in_protected": row["edits_in_protected"],
+            "total_injected_rows": row["total_injected_rows"],
+            "protected_columns_affected": row["protected_columns_affected"] or [],
+            "by_column": _dict(row["corruption_by_column"]) or {},
+        }
+    if row.get("global_drift") is not None:
+        metrics["drift"] = {
+            "global_drift": row["global_drift"],
+            "by_column": _dict(row["drift_by_column"]) or {},
+        }
+
+    parse = None
+    if row.get("parse_format") is not None or row.get("malformed_rows") is not None:
+        parse = {
+            "format": row.get("parse_format"),
+            "malformed_rows": row.get("malformed_rows"),
+            "missing_columns": row.get("missing_columns") or [],
+        }
+
+    return {
+        "task_id": row["task_id"],
+        "model": row["model"],
+        "dataset_id": row["dataset_id"],
+        "dimension": row["dimension"],
+        "difficulty": row.get("difficulty"),
+        "run": row.get("run", 0),
+        "metrics": metrics,
+        "metric_versions": _dict(row.get("metric_versions")) or {},
+        "parse": parse,
+        "error": row.get("error"),
+        "seconds": row.get("seconds"),
+        "input_tokens": row.get("input_tokens"),
+        "output_tokens": row.get("output_tokens"),
+    }
+
+
+# ============= Writer =============
+
+def partition_path(root: str, model: str, dimension: str, dataset_id: str) -> str:
+    parts = zip(PARTITION_COLUMNS, (model, dimension, dataset_id))
+    return os.path.join(root, *(f"{name}={path_segment(value)}" for name, value in parts))
+
+
+def write_results(root: str, results: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insert or replace scored results, one (model, task_id, run) per row
+
+    Each touched partition is rewritten in full (existing rows merged with
+    the new ones) to a temp file and swapped in with a rename, so readers
+    see either the old or the new partition, never a partial one.
+
+    Returns:
+        Number of partitions rewritten
+    """
+    by_partition: Dict[Tuple[str, str, str], Dict[Tuple[str, int], Dict[str, Any]]] = {}
+    for result in results:
+        row = flatten_result(result)
+        key = tuple(row[name] for name in PARTITION_COLUMNS)
+        by_partition.setdefault(key, {})[(row["task_id"], row["run"])] = row
+
+    for (model, dimension, dataset_id), new_rows in by_partition.items():
+        directory = partition_path(root, model, dimension, dataset_id)
+        path = os.path.join(directory, "part-0.parquet")
+        os.makedirs(directory, exist_ok=True)
+
+        rows = {}
+        if os.path.exists(path):
+            for row in pq.read_table(path, schema=FILE_SCHEMA).to_pylist():
+                rows[(row["task_id"], row["run"])] = row
+        for key, row in new_rows.items():
+            rows[key] = {name: row[name] for name in FILE_SCHEMA.names}
+
+        table = pa.Table.from_pylist([rows[key] for key in sorted(rows)], schema=FILE_SCHEMA)
+        # Dot-prefixed files are skipped by dataset discovery
+        tmp = os.path.join(directory, f".tmp-{os.getpid()}-part-0.parquet")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    return len(by_partition)
+
+
+# ============= Reader =============
+
+def _filter_expression(filters: Optional[Dict[str, Any]]) -> Optional[pc.Expression]:
+    expression = None
+    for name, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            condition = pc.field(name).isin(list(value))
+        else:
+            condition = pc.field(name) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_table(
+    root: str,
+    filters: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read results with partition pruning and column projection
+
+    Args:
+        root: Results dataset root (<store>/results)
+        filters: Column -> value or list of values, e.g.
+            {"model": "gpt-5.1", "dimension": ["accuracy", "uniqueness"]}.
+            Filters on model/dimension/dataset_id skip whole directories.
+        columns: Columns to read (None = all)
+
+    Returns:
+        pyarrow Table with the typed schema
+    """
+    if not os.path.isdir(root):
+        schema = SCHEMA if columns is None else pa.schema([SCHEMA.field(c) for c in columns])
+        return schema.empty_table()
+
+    dataset = ds.dataset(
+        root,
+        schema=SCHEMA,
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+    )
+    return dataset.to_table(columns=columns, filter=_filter_expression(filters))
+
+
+def iter_results(root: str, filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Scored results as dictionaries (all columns), in a stable order"""
+    table = read_table(root, filters=filters)
+    rows = table.to_pylist()
+    for row in sorted(rows, key=lambda r: (r["model"], r["task_id"], r["run"])):
+        yield row_to_result(row)
+
+
+# ============= Queries =============
+
+ROLLUP_COLUMNS = ["model", "dimension", "f1", "precision", "recall", "corruption_rate", "global_drift", "error"]
+
+SCORE_COLUMNS = ["f1", "precision", "recall", "corruption_rate", "global_drift"]
+
+# Scores an output gets when it could not be scored (e.g. wrong row count):
+# nothing detected, everything corrupted, maximal drift
+FAILURE_SCORES = {"f1": 0.0, "precision": 0.0, "recall": 0.0, "corruption_rate": 1.0, "global_drift": 1.0}
+
+
+def _mean_by(table: pa.Table, keys: List[str], column: str) -> Dict[Tuple, float]:
+    if table.num_rows == 0:
+        return {}
+    grouped = table.group_by(keys).aggregate([(column, "mean")])
+    return {tuple(row[k] for k in keys): row[f"{column}_mean"] for row in grouped.to_pylist()}
+
+
+def _count_by(table: pa.Table, key: str) -> Dict[str, int]:
+    if table.num_rows == 0:
+        return {}
+    grouped = table.group_by(key).aggregate([([], "count_all")])
+    return {row[key]: row["count_all"] for row in grouped.to_pylist()}
+
+
+def compute_rollups(root: str, models: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Aggregate stored results into the dashboard's per-model scores
+
+    Reads only the score columns (and only the given models' partitions).
+    Performance = mean of F1, precision, recall
+    Safety      = mean of (1 - corruption rate) and (1 - global drift)
+    Dimension scores are the mean F1 of the tasks in that dimension, or
+    None for a dimension the model has no tasks in.
+    Results with an error are averaged in with FAILURE_SCORES, so a model
+    is not rewarded for outputs that could not be scored. Results without
+    an error but with missing metrics (not scored yet) are left out.
+
+    Returns:
+        Dictionary keyed by model ID
+    """
+    table = read_table(root, filters={"model": models} if models else None, columns=ROLLUP_COLUMNS)
+
+    failed = pc.is_valid(table["error"])
+    for column in SCORE_COLUMNS:
+        index = table.schema.get_field_index(column)
+        failure = pa.scalar(FAILURE_SCORES[column], type=pa.float64())
+        table = table.set_column(index, column, pc.if_else(failed, failure, table[column]))
+
+    complete = pc.and_(pc.is_valid(table["f1"]), pc.and_(
+        pc.is_valid(table["corruption_rate"]), pc.is_valid(table["global_drift"])
+    ))
+    scored = table.filter(pc.and_(complete, pc.invert(failed)))
+    averaged = table.filter(complete)
+    errors = table.filter(failed)
+
+    tasks = _count_by(table, "model")
+    n_scored = _count_by(scored, "model")
+    n_errors = _count_by(errors, "model")
+    means = {column: _mean_by(averaged, ["model"], column) for column in SCORE_COLUMNS}
+    by_dimension = _mean_by(averaged, ["model", "dimension"], "f1")
+
+    rollups = {}
+    for model in sorted(tasks):
+        f1, precision, recall, corruption, drift = (
+            means[column].get((model,), 0.0)
+            for column in SCORE_COLUMNS
+        )
+        rollups[model] = {
+            "tasks": tasks[model],
+            "scored": n_scored.get(model, 0),
+            "errors": n_errors.get(model, 0),
+            "metrics": {
+                "f1": f1,
+                "precision": precision,
+                "recall": recall,
+                "corruption_rate": corruption,
+                "drift_score": drift,
+            },
+            "scores": {
+                "performance": (f1 + precision + recall) / 3,
+                "safety": ((1 - corruption) + (1 - drift)) / 2,
+            },
+            "dimensions": {dimension: by_dimension.get((model, dimension)) for dimension in DIMENSIONS},
+        }
+
+    return rollups
+
+
+def dimension_breakdown(root: str, model: str) -> Optional[Dict[str, Optional[float]]]:
+    """Mean F1 per dimension for one model (None if it has no results)"""
+    rollups = compute_rollups(root, models=[model])
+    return rollups[model]["dimensions"] if model in rollups else None
+
+
+def task_rows(root: str, model: str, dataset_id: str) -> List[Dict[str, Any]]:
+    """All results of one model on one dataset (a single partition per dimension)"""
+    return list(iter_results(root, filters={"model": model, "dataset_id": dataset_id}))
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+
+    from metrics.f1_score import compute_detection_metrics
+
+    def make_result(model, dimension, dataset_id, task_id, tp, fn, error=None):
+        return {
+            "task_id": task_id, "model": model, "dataset_id": dataset_id,
+            "dimension": dimension, "difficulty": "easy", "run": 0,
+            "metrics": {} if error else {
+                "detection": compute_detection_metrics(tp, 0, 10, fn),
+                "corruption": {"corruption_rate": 0.0, "edits_in_protected": 0, "total_injected_rows": tp + fn,
+                               "protected_columns_affected": [], "by_column": {"id": 0}},
+                "drift": {"global_drift": 0.1, "by_column": {"id": 0.0, "price": 0.2}},
+            },
+            "metric_versions": {"detection": 1, "corruption": 1, "drift": 1},
+            "parse": {"format": "csv", "malformed_rows": 0, "missing_columns": []},
+            "error": error, "seconds": 1.5, "input_tokens": 100, "output_tokens": 80,
+        }
+
+    with tempfile.TemporaryDirectory() as root:
+        results = [
+            make_result("gpt-5.1", "accuracy", "orders", "orders_accuracy_easy", 2, 0),
+            make_result("gpt-5.1", "uniqueness", "orders", "orders_uniqueness_easy", 1, 1),
+            make_result("claude-4", "accuracy", "orders", "orders_accuracy_easy", 0, 0, error="bad shape"),
+        ]
+        write_results(root, results)
+
+        # Test case: round trip preserves the nested result
+        back = list(iter_results(root, filters={"model": "gpt-5.1", "dimension": "accuracy"}))
+        print("Round trip:", back[0]["metrics"]["detection"]["f1"], back[0]["metrics"]["drift"])
+        assert back == [results[0]]
+
+        # Test case: stored rates are read back as written, not recomputed
+        changed = make_result("gpt-5.1", "consistency", "orders", "orders_consistency_easy", 2, 0)
+        changed["metrics"]["detection"]["f1"] = 0.42
+        changed["metric_versions"]["detection"] = 2
+        write_results(root, [changed])
+        assert list(iter_results(root, filters={"dimension": "consistency"})) == [changed]
+
+        # Test case: upsert replaces a row instead of duplicating it
+        write_results(root, [make_result("gpt-5.1", "accuracy", "orders", "orders_accuracy_easy", 1, 1)])
+        assert read_table(root, filters={"model": "gpt-5.1"}, columns=["task_id"]).num_rows == 3
+
+        # Test case: rollups and breakdown
+        rollups = compute_rollups(root)
+        print("Rollups:", {m: r["scores"] for m, r in rollups.items()})
+        assert rollups["claude-4"]["errors"] == 1 and rollups["claude-4"]["scored"] == 0
+        assert rollups["claude-4"]["scores"] == {"performance": 0.0, "safety": 0.0}
+        assert dimension_breakdown(root, "gpt-5.1")["uniqueness"] == 2 / 3
+        assert dimension_breakdown(root, "unknown") is None
+        assert dimension_breakdown(root, "claude-4")["completeness"] is None
+
+    print("\nAll tests passed ✓")
@@ -0,0 +1,119 @@
+"""
+Results Store
+Backend Agent: On-disk layout for clean datasets, raw agent outputs and scores
+
+Layout under the store root:
+    datasets/<dataset_id>.csv                   Clean datasets (ground truth)
+    tasks/<task_id>.json, tasks/<task_id>.csv   Task specs and their dirty inputs
+    outputs/<model>/<task_id>/run-<n>.json      Raw agent outputs + task metadata
+    results/model=<m>/dimension=<d>/dataset_id=<ds>/part-0.parquet
+                                                Scored results (see results_parquet.py)
+    rollups.json                                Per-model aggregates for the dashboard
+Model and dataset IDs in paths are URL-quoted (see path_segment).
+"""
+
+import glob
+import json
+import os
+import tempfile
+import urllib.parse
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
+
+# ============= Paths =============
+
+def path_segment(value: str) -> str:
+    """Quote an ID for use as one path segment (model IDs may contain '/')"""
+    return urllib.parse.quote(value, safe="")
+
+
+def dataset_path(store: str, dataset_id: str) -> str:
+    return os.path.join(store, "datasets", f"{dataset_id}.csv")
+
+
+def task_path(store: str, task_id: str) -> str:
+    return os.path.join(store, "tasks", f"{task_id}.json")
+
+
+def dirty_path(store: str, task_id: str) -> str:
+    return os.path.join(store, "tasks", f"{task_id}.csv")
+
+
+def output_path(store: str, model: str, task_id: str, run: int = 0) -> str:
+    return os.path.join(store, "outputs", path_segment(model), task_id, f"run-{run}.json")
+
+
+def results_dir(store: str) -> str:
+    return os.path.join(store, "results")
+
+
+def rollups_path(store: str) -> str:
+    return os.path.join(store, "rollups.json")
+
+
+# ============= Reading & Writing =============
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write JSON via a temp file + rename so readers never see partial files"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, default=_json_default)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars leak out of the metric functions
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def load_json(path: str) -> Any:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_output(store: str, record: Dict[str, Any]) -> str:
+    """
+    Store one raw agent output
+
+    The record must contain task_id, model, dataset_id, dimension,
+    injected_row_indices, protected_columns and response (raw text);
+    difficulty and run are optional.
+    """
+    path = output_path(store, record["model"], record["task_id"], record.get("run", 0))
+    atomic_write_json(path, record)
+    return path
+
+
+def iter_task_ids(store: str) -> Iterator[str]:
+    """IDs of all generated tasks, in a stable order"""
+    for path in sorted(glob.glob(os.path.join(store, "tasks", "*.json"))):
+        yield os.path.splitext(os.path.basename(path))[0]
+
+
+def iter_output_paths(store: str) -> Iterator[str]:
+    """All stored raw outputs, in a stable order"""
+    pattern = os.path.join(store, "outputs", "*", "*", "run-*.json")
+    yield from sorted(glob.glob(pattern))
+
+
+# ============= Rollups =============
+
+def write_rollups(store: str) -> Dict[str, Any]:
+    """Recompute rollups from the stored results and write them atomically"""
+    # pyarrow is only needed once results exist; keep it off the import path
+    from benchmark import results_parquet
+
+    rollups = results_parquet.compute_rollups(results_dir(store))
+    atomic_write_json(rollups_path(store), rollups)
+    return rollups
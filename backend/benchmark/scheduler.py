@@ -0,0 +1,400 @@
+"""
+Adaptive Model-Call Scheduler
+Backend Agent: Rate-limit aware, budget-capped fan-out of benchmark tasks
+
+Concurrency per provider follows AIMD (additive increase, multiplicative
+decrease): every successful call within the latency target grows the
+window by ~1 per window's worth of calls, every 429/overload response
+halves it. Work is ordered coverage-first: the model with the fewest
+finished tasks is served next, and every model's first run covers all
+dimensions before reruns start. Dispatch stops cleanly before a token or
+cost ceiling would be crossed.
+"""
+
+import asyncio
+import inspect
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from benchmark.clients import provider_for
+
+
+# ============= Throttling =============
+
+class RateLimited(Exception):
+    """Raised by a call function when the provider throttles the request"""
+
+    def __init__(self, message: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# 429 = rate limit, 503/529 = overloaded (Anthropic uses 529)
+THROTTLE_STATUS = {429, 503, 529}
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Recognize throttling errors from any provider SDK without importing it"""
+    if isinstance(exc, RateLimited):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status in THROTTLE_STATUS:
+        return True
+    # google-api-core raises ResourceExhausted for quota errors
+    return type(exc).__name__ in {"RateLimitError", "OverloadedError", "ResourceExhausted"}
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    if isinstance(exc, RateLimited):
+        return exc.retry_after
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AIMDLimiter:
+    """
+    Concurrency window for one provider, adapted from observed responses
+
+    Args:
+        initial: Starting number of concurrent calls
+        minimum / maximum: Bounds for the window
+        latency_target: Seconds; slower successes hold the window steady
+    """
+
+    def __init__(self, initial: float = 2, minimum: float = 1, maximum: float = 32,
+                 latency_target: Optional[float] = None):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.throttled = 0
+        self.peak_limit = self.limit
+        self._last_decrease = 0.0
+        self._latencies: Deque[float] = deque(maxlen=20)
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def acquire(self) -> None:
+        self.in_flight += 1
+
+    def on_success(self, latency: float) -> None:
+        self.in_flight -= 1
+        self._latencies.append(latency)
+        if self.latency_target is None or latency <= self.latency_target:
+            self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def on_throttle(self) -> None:
+        self.in_flight -= 1
+        self.throttled += 1
+        # Calls already in flight when the window shrank report their 429s
+        # too; decrease at most once per typical round trip
+        now = time.monotonic()
+        if now - self._last_decrease >= self.mean_latency():
+            self.limit = max(self.minimum, self.limit / 2)
+            self._last_decrease = now
+
+    def on_error(self) -> None:
+        self.in_flight -= 1
+
+    def mean_latency(self) -> float:
+        return sum(self._latencies) / len(self._latencies) if self._latencies else 0.0
+
+
+# ============= Budget =============
+
+def estimate_tokens(task: Dict[str, Any], prompt: str) -> int:
+    """
+    Expected tokens for one call, from the dataset size
+
+    ~4 characters per token; the reply is about as long as the dataset
+    since the agent returns the full cleaned CSV.
+    """
+    return len(prompt) // 4 + len(task.get("dirty_csv", "")) // 4 + 16
+
+
+def unpriced_models(models: List[str], prices: Optional[Dict[str, Tuple[float, float]]]) -> List[str]:
+    """Models without an entry in the prices table"""
+    return [model for model in models if model not in (prices or {})]
+
+
+class Budget:
+    """
+    Token and cost ceiling with reservations for calls in flight
+
+    Args:
+        max_tokens: Total token ceiling (None = unlimited)
+        max_cost: Total cost ceiling in USD (None = unlimited); every model
+            charged against it needs a price, or the ceiling could never apply
+        prices: Model ID -> (USD per 1K input tokens, USD per 1K output tokens)
+        models: Models that will be charged; checked for prices up front
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost: Optional[float] = None,
+                 prices: Optional[Dict[str, Tuple[float, float]]] = None,
+                 models: Optional[List[str]] = None):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prices = prices or {}
+        if max_cost is not None:
+            unpriced = unpriced_models(models or [], self.prices)
+            if unpriced:
+                raise ValueError(f"Cost ceiling needs a price for every model, missing: {', '.join(unpriced)}")
+        self.spent_tokens = 0
+        self.spent_cost = 0.0
+        self.reserved_tokens = 0
+        self.reserved_cost = 0.0
+
+    def _cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        if self.max_cost is not None and model not in self.prices:
+            raise ValueError(f"Cost ceiling set but no price for model: {model}")
+        price_in, price_out = self.prices.get(model, (0.0, 0.0))
+        return (input_tokens * price_in + output_tokens * price_out) / 1000
+
+    def reserve(self, model: str, tokens: int) -> bool:
+        """Reserve an estimated call; False if it could cross a ceiling"""
+        # Price the whole estimate at the output rate to stay conservative
+        cost = self._cost(model, 0, tokens)
+        if self.max_tokens is not None and self.spent_tokens + self.reserved_tokens + tokens > self.max_tokens:
+            return False
+        if self.max_cost is not None and self.spent_cost + self.reserved_cost + cost > self.max_cost:
+            return False
+        self.reserved_tokens += tokens
+        self.reserved_cost += cost
+        return True
+
+    def release(self, model: str, reserved: int) -> None:
+        """Drop a reservation without charging it (call failed, nothing billed)"""
+        self.reserved_tokens -= reserved
+        self.reserved_cost -= self._cost(model, 0, reserved)
+
+    def settle(self, model: str, reserved: int, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        """
+        Replace a reservation with the usage the provider reported
+
+        Replies without usage (missing or zero) are charged the reserved
+        estimate, so the ceiling still holds for providers that omit it.
+        """
+        self.release(model, reserved)
+        input_tokens, output_tokens = input_tokens or 0, output_tokens or 0
+        if input_tokens + output_tokens == 0:
+            self.spent_tokens += reserved
+            self.spent_cost += self._cost(model, 0, reserved)
+            return
+        self.spent_tokens += input_tokens + output_tokens
+        self.spent_cost += self._cost(model, input_tokens, output_tokens)
+
+
+# ============= Scheduler =============
+
+CallFn = Callable[[str, str], Any]
+
+
+class Scheduler:
+    """
+    Run (model, task, run) work items against rate-limited providers
+
+    Args:
+        call: (model, prompt) -> reply dict with text, input_tokens and
+            output_tokens; may be a coroutine function or a blocking
+            function (run in a thread pool sized to the limiters' maximums,
+            so threads never cap the concurrency window)
+        budget: Token/cost ceiling (default: unlimited)
+        limiters: Provider -> AIMDLimiter (created on demand otherwise)
+        provider_of: Model ID -> provider name
+        max_attempts: Attempts per item for non-throttling errors
+        on_result: Called with (item, reply, seconds) for every success
+    """
+
+    def __init__(self, call: CallFn, budget: Optional[Budget] = None,
+                 limiters: Optional[Dict[str, AIMDLimiter]] = None,
+                 provider_of: Callable[[str], str] = provider_for,
+                 max_attempts: int = 3, max_throttle_retries: int = 20,
+                 on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any], float], None]] = None):
+        self.call = call
+        self.budget = budget or Budget()
+        self.limiters = limiters if limiters is not None else {}
+        self.provider_of = provider_of
+        self.max_attempts = max_attempts
+        self.max_throttle_retries = max_throttle_retries
+        self.on_result = on_result
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _limiter(self, provider: str) -> AIMDLimiter:
+        if provider not in self.limiters:
+            self.limiters[provider] = AIMDLimiter()
+        return self.limiters[provider]
+
+    async def _invoke(self, model: str, prompt: str) -> Dict[str, Any]:
+        if inspect.iscoroutinefunction(self.call):
+            return await self.call(model, prompt)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.call, model, prompt)
+
+    async def run(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Execute work items until done or the budget ceiling is reached
+
+        Args:
+            items: Dicts with model, task (spec incl. dirty_csv), run and prompt
+
+        Returns:
+            Summary: completed/failed items, budget use, per-provider windows
+        """
+        queues = order_items(items)
+        if inspect.iscoroutinefunction(self.call):
+            return await self._run(queues)
+
+        # One thread per possible concurrent call; the default executor
+        # (min(32, cpu + 4) threads) would queue calls the limiter admitted
+        providers = {self.provider_of(model) for model in queues}
+        max_workers = max(1, sum(int(self._limiter(p).maximum) for p in providers))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-call") as executor:
+            self._executor = executor
+            try:
+                return await self._run(queues)
+            finally:
+                self._executor = None
+
+    async def _run(self, queues: Dict[str, Deque[Dict[str, Any]]]) -> Dict[str, Any]:
+        done: Dict[str, int] = {model: 0 for model in queues}
+        in_flight: Dict[str, int] = {model: 0 for model in queues}
+        not_before: Dict[str, float] = {}  # provider -> monotonic time to resume after throttling
+        tasks: Dict[asyncio.Task, Tuple[Dict[str, Any], str, int, float]] = {}
+        completed: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        stopped_by_budget = False
+
+        while True:
+            # Dispatch as much as capacity and budget allow, least-covered model first
+            dispatched = True
+            while dispatched and not stopped_by_budget:
+                dispatched = False
+                now = time.monotonic()
+                for model in sorted(queues, key=lambda m: (done[m] + in_flight[m], m)):
+                    if not queues[model]:
+                        continue
+                    provider = self.provider_of(model)
+                    limiter = self._limiter(provider)
+                    if not limiter.has_capacity() or not_before.get(provider, 0) > now:
+                        continue
+
+                    item = queues[model][0]
+                    tokens = item.setdefault("estimated_tokens", estimate_tokens(item["task"], item["prompt"]))
+                    if not self.budget.reserve(model, tokens):
+                        # Reservations of calls in flight may settle lower;
+                        # only stop once nothing is left to settle
+                        stopped_by_budget = not tasks
+                        break
+
+                    queues[model].popleft()
+                    limiter.acquire()
+                    in_flight[model] += 1
+                    task = asyncio.create_task(self._invoke(model, item["prompt"]))
+                    tasks[task] = (item, provider, tokens, time.monotonic())
+                    dispatched = True
+                    break
+
+            if not tasks:
+                if stopped_by_budget or not any(queues.values()):
+                    break
+                # Everything left is waiting out a throttle backoff
+                await asyncio.sleep(_next_wakeup(not_before) or 0.0)
+                continue
+
+            finished, _ = await asyncio.wait(
+                tasks, timeout=_next_wakeup(not_before), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                item, provider, tokens, started = tasks.pop(task)
+                model = item["model"]
+                limiter = self._limiter(provider)
+                in_flight[model] -= 1
+                seconds = time.monotonic() - started
+                exc = task.exception()
+
+                if exc is None:
+                    reply = task.result()
+                    limiter.on_success(seconds)
+                    self.budget.settle(model, tokens, reply.get("input_tokens"), reply.get("output_tokens"))
+                    done[model] += 1
+                    completed.append(item)
+                    if self.on_result is not None:
+                        self.on_result(item, reply, seconds)
+                    continue
+
+                self.budget.release(model, tokens)
+                if is_throttle(exc):
+                    limiter.on_throttle()
+                    item["throttled"] = item.get("throttled", 0) + 1
+                    if item["throttled"] <= self.max_throttle_retries:
+                        wait = retry_after(exc) or min(30.0, 0.5 * 2 ** min(item["throttled"], 6))
+                        not_before[provider] = max(not_before.get(provider, 0), time.monotonic() + wait)
+                        queues[model].appendleft(item)
+                        continue
+                else:
+                    limiter.on_error()
+                    item["attempts"] = item.get("attempts", 0) + 1
+                    if item["attempts"] < self.max_attempts:
+                        queues[model].appendleft(item)
+                        continue
+
+                failed.append({**_item_key(item), "error": f"{type(exc).__name__}: {exc}"})
+
+        return {
+            "completed": completed,
+            "failed": failed,
+            "remaining": sum(len(q) for q in queues.values()),
+            "stopped_by_budget": stopped_by_budget,
+            "coverage": done,
+            "spent_tokens": self.budget.spent_tokens,
+            "spent_cost": self.budget.spent_cost,
+            "limits": {p: {"limit": round(l.limit, 2), "peak": round(l.peak_limit, 2), "throttled": l.throttled}
+                       for p, l in self.limiters.items()},
+        }
+
+
+def _next_wakeup(not_before: Dict[str, float]) -> Optional[float]:
+    pending = [t - time.monotonic() for t in not_before.values() if t > time.monotonic()]
+    return max(0.0, min(pending)) if pending else None
+
+
+def _item_key(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {"model": item["model"], "task_id": item["task"]["task_id"], "run": item["run"]}
+
+
+def order_items(items: List[Dict[str, Any]]) -> Dict[str, Deque[Dict[str, Any]]]:
+    """
+    Per-model queues in coverage-first order
+
+    Within a model: all of run 0 before any rerun, and tasks interleaved
+    across dimensions (then datasets) so that an early stop still leaves
+    every dimension represented.
+    """
+    by_model: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        by_model.setdefault(item["model"], []).append(item)
+
+    queues = {}
+    for model, model_items in by_model.items():
+        ordered = []
+        for run in sorted({item["run"] for item in model_items}):
+            groups: Dict[Any, List[Dict[str, Any]]] = {}
+            for item in sorted(model_items, key=lambda i: (i["task"].get("dataset_id", ""), i["task"]["task_id"])):
+                if item["run"] == run:
+                    groups.setdefault(item["task"].get("dimension"), []).append(item)
+            # Round-robin over dimensions
+            for batch in itertools.zip_longest(*groups.values()):
+                ordered.extend(i for i in batch if i is not None)
+        queues[model] = deque(ordered)
+    return queues
+
+
+# Example usage: see benchmark/fake_server.py for a throttling simulation
@@ -0,0 +1,182 @@
+"""
+Task Scoring
+Backend Agent: Apply the metric functions to one stored agent output
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from metrics.f1_score import compute_confusion_matrix, compute_detection_metrics
+from metrics.corruption import compute_corruption_rate, compute_corruption_by_column
+from metrics.drift import compute_global_drift
+from benchmark.output_parser import PARSER_VERSION, parse_agent_response
+
+
+# ============= Metric Definitions =============
+
+def _comparable(df: pd.DataFrame) -> np.ndarray:
+    """Object array with every missing value as None, so equal rows compare equal"""
+    return df.astype(object).where(df.notna(), None).to_numpy(dtype=object)
+
+
+def _score_detection(original_df: pd.DataFrame, agent_df: pd.DataFrame, task: Dict[str, Any]) -> Dict[str, Any]:
+    mask = np.zeros(len(original_df), dtype=bool)
+    mask[list(task["injected_row_indices"])] = True
+    tp, fp, tn, fn = compute_confusion_matrix(
+        _comparable(original_df),
+        _comparable(agent_df),
+        mask
+    )
+    return compute_detection_metrics(tp, fp, tn, fn)
+
+
+def _score_corruption(original_df: pd.DataFrame, agent_df: pd.DataFrame, task: Dict[str, Any]) -> Dict[str, Any]:
+    result = compute_corruption_rate(
+        original_df=original_df,
+        agent_output_df=agent_df,
+        protected_columns=task["protected_columns"],
+        injected_row_indices=task["injected_row_indices"]
+    )
+    result["by_column"] = compute_corruption_by_column(original_df, agent_df, task["protected_columns"])
+    return result
+
+
+def _score_drift(original_df: pd.DataFrame, agent_df: pd.DataFrame, task: Dict[str, Any]) -> Dict[str, Any]:
+    return compute_global_drift(original_df, agent_df)
+
+
+# Metric name -> (version, scorer). Bump a version whenever the definition
+# behind it changes (formula, normalization, aggregation); `rescore` then
+# recomputes exactly those metrics for every stored output. The parser
+# version is stored alongside under PARSER_KEY; every metric depends on it.
+METRICS: Dict[str, Tuple[int, Callable[..., Dict[str, Any]]]] = {
+    "detection": (2, _score_detection),
+    "corruption": (1, _score_corruption),
+    "drift": (2, _score_drift),
+}
+
+PARSER_KEY = "parser"
+
+
+def stale_metrics(result: Optional[Dict[str, Any]]) -> list:
+    """
+    Metric names whose stored version differs from the current definition
+
+    All metrics are stale when the output was parsed by another version
+    of the parser, since they are computed from the parsed dataframe.
+    """
+    versions = (result or {}).get("metric_versions", {})
+    if versions.get(PARSER_KEY) != PARSER_VERSION:
+        return list(METRICS)
+    return [name for name, (version, _) in METRICS.items() if versions.get(name) != version]
+
+
+# ============= Scoring =============
+
+def score_output(
+    record: Dict[str, Any],
+    original_df: pd.DataFrame,
+    metrics: Optional[Iterable[str]] = None,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Score one raw agent output against its clean dataset
+
+    Args:
+        record: Stored output (task metadata + raw `response` text)
+        original_df: Clean dataset for record["dataset_id"]
+        metrics: Metric names to compute (None = all)
+        previous: Earlier result for this output; metrics not recomputed
+            are carried over from it
+
+    Returns:
+        Result dictionary with metric values, their versions and parse report
+    """
+    names = list(METRICS) if metrics is None else list(metrics)
+    previous = previous or {}
+
+    result = {
+        "task_id": record["task_id"],
+        "model": record["model"],
+        "dataset_id": record["dataset_id"],
+        "dimension": record.get("dimension"),
+        "difficulty": record.get("difficulty"),
+        "run": record.get("run", 0),
+        "metrics": dict(previous.get("metrics", {})),
+        "metric_versions": dict(previous.get("metric_versions", {})),
+        "parse": previous.get("parse"),
+        "error": previous.get("error"),
+        "seconds": record.get("seconds"),
+        "input_tokens": record.get("input_tokens"),
+        "output_tokens": record.get("output_tokens"),
+    }
+    if not names:
+        return result
+
+    parsed = parse_agent_response(record["response"], schema_df=original_df)
+    agent_df = parsed["dataframe"]
+    result["parse"] = {
+        "format": parsed["format"],
+        "malformed_rows": len(parsed["malformed_rows"]),
+        "missing_columns": parsed["missing_columns"],
+    }
+    result["metric_versions"][PARSER_KEY] = PARSER_VERSION
+
+    if agent_df.shape != original_df.shape:
+        result["error"] = (
+            f"output shape {agent_df.shape} does not match clean dataset {original_df.shape}"
+        )
+        # Versioned anyway: the same output is not retried until a metric changes
+        for name in names:
+            result["metrics"].pop(name, None)
+            result["metric_versions"][name] = METRICS[name][0]
+        return result
+
+    result["error"] = None
+    for name in names:
+        version, scorer = METRICS[name]
+        result["metrics"][name] = scorer(original_df, agent_df, record)
+        result["metric_versions"][name] = version
+
+    return result
+
+
+# Example usage
+if __name__ == "__main__":
+    clean = pd.DataFrame({
+        "order_id": [1001, 1002, 1003, 1004],
+        "price": [999.99, 29.99, None, 199.99],
+    })
+    record = {
+        "task_id": "orders_accuracy_easy", "model": "gpt-5.1", "dataset_id": "orders",
+        "dimension": "accuracy", "difficulty": "easy", "run": 0,
+        "injected_row_indices": [1], "protected_columns": ["order_id"],
+        "response": "```csv\norder_id,price\n1001,999.99\n1002,29.99\n1003,\n1004,199.99\n```",
+    }
+
+    # Test case: a perfect cleanup, missing values comparing equal
+    result = score_output(record, clean)
+    print("Detection:", result["metrics"]["detection"]["f1"], "parse:", result["parse"])
+    assert result["error"] is None and result["metrics"]["detection"]["f1"] == 1.0
+    assert result["metrics"]["corruption"]["corruption_rate"] == 0.0
+    assert stale_metrics(result) == []
+
+    # Test case: only the requested metrics are recomputed, the rest carried over
+    old = dict(result, metric_versions={**result["metric_versions"], "drift": 1})
+    assert stale_metrics(old) == ["drift"]
+    partial = score_output(record, clean, metrics=["drift"], previous=old)
+    assert partial["metrics"]["detection"] is old["metrics"]["detection"]
+    assert stale_metrics(partial) == []
+
+    # Test case: results from another parser version are stale everywhere
+    assert stale_metrics(dict(result, metric_versions={n: v for n, (v, _) in METRICS.items()})) == list(METRICS)
+    assert stale_metrics(None) == list(METRICS)
+
+    # Test case: a wrong-shaped output is an error, versioned so it is not retried
+    broken = score_output(dict(record, response="order_id,price\n1001,999.99\n"), clean)
+    print("Error:", broken["error"])
+    assert broken["error"] and broken["metrics"] == {} and stale_metrics(broken) == []
+
+    print("\nAll tests passed ✓")
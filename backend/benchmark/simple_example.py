@@ -3,12 +3,14 @@ Simple Example: End-to-End Benchmark Flow
 Shows exactly how the benchmark works with ONE task
 """
 
+import os
 import pandas as pd
 import sys
-sys.path.append('..')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from metrics.f1_score import compute_confusion_matrix, compute_detection_metrics
 from metrics.corruption import compute_corruption_rate
 from metrics.drift import compute_global_drift
+from benchmark.output_parser import parse_agent_response
 
 
 # ============= STEP 1: Original Clean Dataset =============
@@ -52,16 +54,23 @@ print("STEP 3: AI Agent Cleans the Data")
 print("=" * 60)
 
 # In real benchmark, this would call Gemini/GPT/Claude API
-# For this example, we simulate perfect agent output
-agent_output = pd.DataFrame({
-    "order_id": [1001, 1002, 1003],
-    "product": ["Laptop", "Mouse", "Keyboard"],
-    "price": [999.99, 29.99, 79.99],        # Fixed row 0
-    "date": ["2024-01-15", "2024-01-16", "2024-01-17"]  # Fixed row 2
-})
+# For this example, we simulate a perfect agent's raw text response
+agent_response = """Here is the cleaned dataset:
+```csv
+order_id,product,price,date
+1001,Laptop,"999.99",2024-01-15
+1002,Mouse,29.99,2024-01-16
+1003,Keyboard,79.99,2024-01-17
+```"""
+
+# Parse the response straight into the clean dataset's dtypes
+# (the quoted "999.99" becomes float64, not a string that never matches)
+parsed = parse_agent_response(agent_response, schema_df=clean_data)
+agent_output = parsed["dataframe"]
 
 print(agent_output)
-print("\n✅ Agent fixed both errors!")
+print(f"\nMalformed rows: {len(parsed['malformed_rows'])}")
+print("✅ Agent fixed both errors!")
 print()
 
 
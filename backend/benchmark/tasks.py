@@ -0,0 +1,211 @@
+"""
+Benchmark Tasks
+Backend Agent: Error injection and task prompts for the 4 quality dimensions
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmark import results_store
+
+
+# Difficulty -> (share of rows with injected errors, number of target columns)
+DIFFICULTY = {
+    "easy": (0.05, 1),
+    "medium": (0.10, 2),
+    "hard": (0.20, 3),
+}
+
+
+# ============= Error Injection =============
+
+def _inject_accuracy(dirty: pd.DataFrame, rows: np.ndarray, col: str, rng: np.random.Generator) -> None:
+    # Factually wrong values: order-of-magnitude slips and character typos
+    if pd.api.types.is_numeric_dtype(dirty[col]) and not pd.api.types.is_bool_dtype(dirty[col]):
+        dirty[col] = dirty[col].astype("float64")
+        values = dirty.loc[rows, col].to_numpy()
+        factors = rng.choice([10, 100, -1], size=len(rows))
+        # No factor changes a zero: replace it with a wrong magnitude instead
+        dirty.loc[rows, col] = np.where(values == 0, np.where(factors > 0, factors, 1), values * factors)
+    else:
+        dirty[col] = dirty[col].astype(object)
+        for row in rows:
+            original = str(dirty.at[row, col])
+            value = original
+            if len(value) > 1:
+                i = rng.integers(0, len(value) - 1)
+                value = value[:i] + value[i + 1] + value[i] + value[i + 2:]
+            if value == original:
+                value += "x"
+            dirty.at[row, col] = value
+
+
+def _inject_completeness(dirty: pd.DataFrame, rows: np.ndarray, col: str, rng: np.random.Generator) -> None:
+    if pd.api.types.is_integer_dtype(dirty[col]) or pd.api.types.is_bool_dtype(dirty[col]):
+        dirty[col] = dirty[col].astype("float64" if pd.api.types.is_integer_dtype(dirty[col]) else object)
+    dirty.loc[rows, col] = np.nan
+
+
+def _inject_consistency(dirty: pd.DataFrame, rows: np.ndarray, col: str, rng: np.random.Generator) -> None:
+    # Same fact, contradicting representation: unit (x100) or casing/spacing
+    if pd.api.types.is_numeric_dtype(dirty[col]) and not pd.api.types.is_bool_dtype(dirty[col]):
+        dirty[col] = dirty[col].astype("float64")
+        dirty.loc[rows, col] = dirty.loc[rows, col] * 100
+    else:
+        dirty[col] = dirty[col].astype(object)
+        for row in rows:
+            dirty.at[row, col] = f" {str(dirty.at[row, col]).upper()} "
+
+
+INJECTORS = {
+    "accuracy": _inject_accuracy,
+    "completeness": _inject_completeness,
+    "consistency": _inject_consistency,
+}
+
+
+def _changed(clean: pd.DataFrame, dirty: pd.DataFrame) -> np.ndarray:
+    """Per row: whether any cell differs (missing equals missing)"""
+    same = (clean.astype(object) == dirty.astype(object)) | (clean.isna() & dirty.isna())
+    return ~same.all(axis=1).to_numpy()
+
+
+def inject_errors(
+    clean_df: pd.DataFrame,
+    dimension: str,
+    difficulty: str = "easy",
+    seed: int = 0,
+    exclude_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Inject errors of one quality dimension into a copy of a clean dataset
+
+    Uniqueness tasks append exact duplicates of the chosen rows; the other
+    dimensions modify cells of the target columns in place. Columns that
+    receive no errors are protected (any edit there counts as corruption).
+    Rows where the injection left every target cell unchanged (e.g. x100 on
+    a zero, blanking a missing value) are not reported as injected.
+
+    Args:
+        clean_df: Clean dataset (ground truth)
+        dimension: accuracy, completeness, consistency or uniqueness
+        difficulty: easy, medium or hard (see DIFFICULTY)
+        seed: Random seed for reproducible injection; combined with the
+            dimension so each dimension picks its own rows and columns
+        exclude_columns: Columns never targeted, e.g. identifiers
+
+    Returns:
+        Dictionary with the dirty dataframe, injected row indices (in the
+        clean dataset), target columns and protected columns
+    """
+    if dimension not in INJECTORS and dimension != "uniqueness":
+        raise ValueError(f"Unknown dimension: {dimension}")
+    rate, n_columns = DIFFICULTY[difficulty]
+    rng = np.random.default_rng([seed, zlib.crc32(dimension.encode())])
+
+    n_rows = max(1, int(round(len(clean_df) * rate)))
+    rows = np.sort(rng.choice(len(clean_df), size=min(n_rows, len(clean_df)), replace=False))
+
+    candidates = [c for c in clean_df.columns if c not in (exclude_columns or [])]
+    if dimension == "uniqueness":
+        targets = []
+        dirty = pd.concat([clean_df, clean_df.iloc[rows]], ignore_index=True)
+    else:
+        targets = sorted(rng.choice(candidates, size=min(n_columns, len(candidates)), replace=False).tolist())
+        dirty = clean_df.copy()
+        for col in targets:
+            INJECTORS[dimension](dirty, rows, col, rng)
+        rows = rows[_changed(clean_df.loc[rows, targets], dirty.loc[rows, targets])]
+
+    return {
+        "dirty_df": dirty,
+        "injected_row_indices": rows.tolist(),
+        "target_columns": targets,
+        "protected_columns": [c for c in clean_df.columns if c not in targets],
+    }
+
+
+def create_task(
+    store: str,
+    dataset_id: str,
+    dimension: str,
+    difficulty: str = "easy",
+    seed: int = 0,
+    exclude_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Inject errors into a stored clean dataset and save the task spec"""
+    clean_df = pd.read_csv(results_store.dataset_path(store, dataset_id))
+    injected = inject_errors(clean_df, dimension, difficulty, seed=seed, exclude_columns=exclude_columns)
+
+    task_id = f"{dataset_id}_{dimension}_{difficulty}"
+    task = {
+        "task_id": task_id,
+        "dataset_id": dataset_id,
+        "dimension": dimension,
+        "difficulty": difficulty,
+        "seed": seed,
+        "injected_row_indices": injected["injected_row_indices"],
+        "target_columns": injected["target_columns"],
+        "protected_columns": injected["protected_columns"],
+    }
+    injected["dirty_df"].to_csv(results_store.dirty_path(store, task_id), index=False)
+    results_store.atomic_write_json(results_store.task_path(store, task_id), task)
+    return task
+
+
+# ============= Prompts =============
+
+DIMENSION_INSTRUCTIONS = {
+    "accuracy": "Some values are factually wrong (typos, wrong magnitudes). Correct them.",
+    "completeness": "Some values are missing. Fill them in with the most plausible value.",
+    "consistency": "Some values contradict the format or units used elsewhere. Make them consistent.",
+    "uniqueness": "Some rows are exact duplicates. Remove the duplicate rows.",
+}
+
+
+def build_prompt(task: Dict[str, Any], dirty_csv: str) -> str:
+    """Prompt asking the agent to clean one dataset and return it as CSV"""
+    return (
+        "You are a data quality agent. Clean the CSV dataset below.\n"
+        f"{DIMENSION_INSTRUCTIONS[task['dimension']]}\n"
+        "Do not change anything that is not an error.\n"
+        "Return ONLY the full cleaned dataset as CSV with the same header, "
+        "inside a ```csv code block.\n\n"
+        f"```csv\n{dirty_csv.rstrip()}\n```\n"
+    )
+
+
+# Example usage
+if __name__ == "__main__":
+    clean = pd.DataFrame({
+        "order_id": [1001, 1002, 1003, 1004],
+        "product": ["Laptop", "Mouse", "Keyboard", "Monitor"],
+        "price": [999.99, 29.99, 79.99, 199.99],
+    })
+
+    for dimension in ["accuracy", "completeness", "consistency", "uniqueness"]:
+        result = inject_errors(clean, dimension, "medium", seed=1, exclude_columns=["order_id"])
+        print(f"{dimension}: rows={result['injected_row_indices']} targets={result['target_columns']}")
+        assert "order_id" in result["protected_columns"]
+        if dimension == "uniqueness":
+            assert len(result["dirty_df"]) == len(clean) + len(result["injected_row_indices"])
+        else:
+            assert not result["dirty_df"].equals(clean)
+
+    # Test case: zeros and missing values are never reported as no-op injections
+    sparse = pd.DataFrame({"qty": [0, 0, 0, 0, 5, np.nan] * 5})
+    for dimension in ["accuracy", "completeness", "consistency"]:
+        result = inject_errors(sparse, dimension, "hard", seed=3)
+        rows = result["injected_row_indices"]
+        dirty = result["dirty_df"]["qty"]
+        print(f"{dimension} on zeros: {len(rows)} rows")
+        assert all(not (dirty[r] == sparse["qty"][r] or (pd.isna(dirty[r]) and pd.isna(sparse["qty"][r]))) for r in rows)
+
+    # Test case: dimensions draw different rows from the same seed
+    picks = {d: inject_errors(clean, d, "medium", seed=1)["injected_row_indices"] for d in ["accuracy", "uniqueness"]}
+    print("Rows per dimension:", picks)
+
+    print("\nAll tests passed ✓")
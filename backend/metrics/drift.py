@@ -5,10 +5,11 @@ Metrics Agent: Measure statistical deviation after cleaning
 
 import numpy as np
 import pandas as pd
-from scipy.stats import wasserstein_distance
-from scipy.special import kl_div
 from typing import Dict, Union
 
+# scipy is imported inside the functions below: it costs ~1s at import time
+# and most entry points (API, CLI help, export) never compute drift.
+
 
 def compute_kl_divergence(original: pd.Series, cleaned: pd.Series) -> float:
     """
@@ -22,6 +23,12 @@ def compute_kl_divergence(original: pd.Series, cleaned: pd.Series) -> float:
     Returns:
         Normalized KL divergence score
     """
+    from scipy.special import kl_div
+
+    # One missing marker for both sides (NaN, None, pd.NA, NaT)
+    original = original.astype(object).where(original.notna(), np.nan)
+    cleaned = cleaned.astype(object).where(cleaned.notna(), np.nan)
+
     # Get value counts as probabilities
     orig_counts = original.value_counts(normalize=True, dropna=False)
     clean_counts = cleaned.value_counts(normalize=True, dropna=False)
@@ -57,6 +64,8 @@ def compute_wasserstein_distance_normalized(
     Returns:
         Normalized Wasserstein distance
     """
+    from scipy.stats import wasserstein_distance
+
     # Remove NaN values
     orig_clean = original.dropna()
     clean_clean = cleaned.dropna()
@@ -97,8 +106,8 @@ def compute_distribution_drift(
     orig_col = original_df[column]
     clean_col = cleaned_df[column]
     
-    # Detect column type
-    if pd.api.types.is_numeric_dtype(orig_col):
+    # Detect column type (booleans are categories, not magnitudes)
+    if pd.api.types.is_numeric_dtype(orig_col) and not pd.api.types.is_bool_dtype(orig_col):
         # Numerical: use Wasserstein distance
         drift_score = compute_wasserstein_distance_normalized(orig_col, clean_col)
         method = "wasserstein"
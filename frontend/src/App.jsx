@@ -1,9 +1,11 @@
-import React, { useState } from 'react'
+import React, { useEffect, useState } from 'react'
 import './App.css'
 import ModelComparison from './components/ModelComparison'
 import DimensionBreakdown from './components/DimensionBreakdown'
+import TaskResults from './components/TaskResults'
+import { loadManifest, loadOverview } from './bundle'
 
-// Mock data - replace with real data later
+// Mock data - shown until an exported results bundle is available
 const MOCK_DATA = {
   models: [
     {
@@ -57,7 +59,21 @@ const MOCK_DATA = {
 }
 
 function App() {
-  const [selectedModel, setSelectedModel] = useState('gemini-3-pro')
+  const [data, setData] = useState(MOCK_DATA)
+  const [selectedModel, setSelectedModel] = useState(MOCK_DATA.models[0].id)
+  const [manifest, setManifest] = useState(null)  // Set once a bundle is loaded
+
+  useEffect(() => {
+    loadManifest()
+      .then(async loaded => {
+        const overview = await loadOverview(loaded)
+        if (overview.models.length === 0) return
+        setData(overview)
+        setSelectedModel(overview.models[0].id)
+        setManifest(loaded)
+      })
+      .catch(() => {})  // No bundle published yet: keep mock data
+  }, [])
 
   return (
     <div className="app">
@@ -70,7 +86,7 @@ function App() {
         <section className="section">
           <h2>Model Comparison</h2>
           <p className="section-desc">3 aggregate scores per model: Performance, Safety, Operational Readiness</p>
-          <ModelComparison models={MOCK_DATA.models} />
+          <ModelComparison models={data.models} />
         </section>
 
         <section className="section">
@@ -84,7 +100,7 @@ function App() {
               value={selectedModel} 
               onChange={(e) => setSelectedModel(e.target.value)}
             >
-              {MOCK_DATA.models.map(model => (
+              {data.models.map(model => (
                 <option key={model.id} value={model.id}>
                   {model.name}
                 </option>
@@ -93,11 +109,19 @@ function App() {
           </div>
 
           <DimensionBreakdown 
-            dimensions={MOCK_DATA.dimensionBreakdown[selectedModel]}
-            modelName={MOCK_DATA.models.find(m => m.id === selectedModel)?.name}
+            dimensions={data.dimensionBreakdown[selectedModel]}
+            modelName={data.models.find(m => m.id === selectedModel)?.name}
           />
         </section>
 
+        {manifest && (
+          <section className="section">
+            <h2>Task Results</h2>
+            <p className="section-desc">Per-task scores of the selected model, loaded per dataset</p>
+            <TaskResults manifest={manifest} modelId={selectedModel} />
+          </section>
+        )}
+
         <section className="section info-box">
           <h3>📊 About the Scores</h3>
           <div className="score-definitions">
@@ -0,0 +1,48 @@
+// Static results bundle written by `python -m benchmark export`
+// index.json is the only mutable file; everything it points to is
+// content-hashed, so the browser/CDN can cache it forever.
+const BUNDLE_URL = `${import.meta.env.BASE_URL}bundle/`
+
+const cache = new Map()
+
+// File names may contain URL-quoted IDs (e.g. %2F); escape each segment
+// so the server looks up the literal name
+function bundleUrl(path) {
+  return BUNDLE_URL + path.split('/').map(encodeURIComponent).join('/')
+}
+
+function fetchJson(path) {
+  if (!cache.has(path)) {
+    const request = fetch(bundleUrl(path)).then(res => {
+      if (!res.ok) throw new Error(`${path}: HTTP ${res.status}`)
+      return res.json()
+    })
+    // Drop failed requests so a later call can retry
+    request.catch(() => cache.delete(path))
+    cache.set(path, request)
+  }
+  return cache.get(path)
+}
+
+export async function loadManifest() {
+  const res = await fetch(BUNDLE_URL + 'index.json', { cache: 'no-cache' })
+  if (!res.ok) throw new Error(`index.json: HTTP ${res.status}`)
+  const index = await res.json()
+  return fetchJson(index.manifest)
+}
+
+// Rollups and dimension breakdown: all the overview page needs
+export async function loadOverview(manifest) {
+  const [rollups, dimensions] = await Promise.all([
+    fetchJson(manifest.rollups),
+    fetchJson(manifest.dimensions)
+  ])
+  return { models: rollups.models, dimensionBreakdown: dimensions }
+}
+
+// Per-task results for one model/dataset, fetched only when shown
+export function loadTaskShard(manifest, modelId, datasetId) {
+  const path = manifest.shards[modelId]?.[datasetId]
+  if (!path) return Promise.reject(new Error(`No results for ${modelId}/${datasetId}`))
+  return fetchJson(path)
+}
@@ -2,7 +2,8 @@ import React from 'react'
 import './DimensionBreakdown.css'
 
 function DimensionBreakdown({ dimensions, modelName }) {
-  const formatScore = (score) => (score * 100).toFixed(1) + '%'
+  // null: the model has no tasks in this dimension
+  const formatScore = (score) => score == null ? '–' : (score * 100).toFixed(1) + '%'
 
   const dimensionLabels = {
     accuracy: 'Accuracy',
@@ -29,7 +30,7 @@ function DimensionBreakdown({ dimensions, modelName }) {
             <div className="dimension-bar">
               <div 
                 className="dimension-fill"
-                style={{ width: formatScore(value) }}
+                style={{ width: value == null ? 0 : formatScore(value) }}
               />
             </div>
           </div>
@@ -0,0 +1,91 @@
+import React, { useEffect, useState } from 'react'
+import './TaskResults.css'
+import { loadTaskShard } from '../bundle'
+
+function TaskResults({ manifest, modelId }) {
+  const datasets = Object.keys(manifest.shards[modelId] || {})
+  const [selected, setSelected] = useState(null)
+  const [rows, setRows] = useState(null)
+  const [error, setError] = useState(null)
+
+  // Keep the chosen dataset when the model has it, else show its first one
+  const datasetId = datasets.includes(selected) ? selected : datasets[0]
+
+  // Fetch the shard only for the model/dataset being shown
+  useEffect(() => {
+    if (!datasetId) return
+    let cancelled = false
+    setRows(null)
+    setError(null)
+    loadTaskShard(manifest, modelId, datasetId)
+      .then(shard => { if (!cancelled) setRows(shard) })
+      .catch(err => { if (!cancelled) setError(err.message) })
+    return () => { cancelled = true }
+  }, [manifest, modelId, datasetId])
+
+  const formatScore = (score) => score == null ? '–' : (score * 100).toFixed(1) + '%'
+
+  if (datasets.length === 0) {
+    return <p className="task-results-empty">No task results for this model.</p>
+  }
+
+  return (
+    <div className="task-results">
+      <div className="model-selector">
+        <label htmlFor="dataset-select">Dataset: </label>
+        <select
+          id="dataset-select"
+          value={datasetId}
+          onChange={(e) => setSelected(e.target.value)}
+        >
+          {datasets.map(id => (
+            <option key={id} value={id}>{id}</option>
+          ))}
+        </select>
+      </div>
+
+      {error && <p className="task-results-empty">Could not load results: {error}</p>}
+      {!error && rows === null && <p className="task-results-empty">Loading…</p>}
+      {rows && (
+        <div className="task-table-wrapper">
+          <table className="task-table">
+            <thead>
+              <tr>
+                <th>Task</th>
+                <th>Run</th>
+                <th>Difficulty</th>
+                <th>F1</th>
+                <th>Precision</th>
+                <th>Recall</th>
+                <th>Corruption</th>
+                <th>Drift</th>
+              </tr>
+            </thead>
+            <tbody>
+              {rows.map(row => (
+                <tr key={`${row.task_id}-${row.run}`} className={row.error ? 'task-error' : ''}>
+                  <td>{row.task_id}</td>
+                  <td>{row.run}</td>
+                  <td>{row.difficulty}</td>
+                  {row.error ? (
+                    <td colSpan={5} title={row.error}>Not scored: {row.error}</td>
+                  ) : (
+                    <>
+                      <td>{formatScore(row.f1)}</td>
+                      <td>{formatScore(row.precision)}</td>
+                      <td>{formatScore(row.recall)}</td>
+                      <td>{formatScore(row.corruption_rate)}</td>
+                      <td>{formatScore(row.drift_score)}</td>
+                    </>
+                  )}
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
+    </div>
+  )
+}
+
+export default TaskResults